@@ -3,21 +3,60 @@ from __future__ import annotations
 import os
 import re
 import json
+import mmap
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
 from datetime import datetime, timedelta, date
+from itertools import chain
 from pathlib import Path
-from threading import Event
-from typing import Any, Dict, List, Optional, Tuple
+from threading import Event, Lock, Thread
+from typing import Any, Dict, List, Optional, Set, Tuple
+from urllib.parse import unquote
 
 import pytz
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
 
 from app.core.config import settings
+from app.core.event import eventmanager, Event as PluginEvent
 from app.helper.downloader import DownloaderHelper
 from app.log import logger
 from app.plugins import _PluginBase
 from app.schemas import NotificationType, ServiceInfo, Response
-from app.utils.http import RequestUtils
+from app.schemas.types import EventType
+
+from .backup import TorrentBackupStore
+from .bencode import BencodeError, TorrentMeta, parse_torrent
+from .filecheck import PayloadChecker
+from .filters import CandidateFilter
+from .qbapi import QbApiSession, QbSyncMirror, QbTorrent
+from .ratelimit import TokenBucketLimiter
+from .resolver import TrackerSiteResolver
+from .store import ReseedEventStore, ReseedStateStore, ReseedStatsStore
+
+
+class _PendingVerification:
+    """
+    重新添加成功、等待批量确认的种子，可被多个处理线程同时写入；
+    attempts 为确认时未找到任务而再次添加的次数
+    """
+
+    def __init__(self):
+        self._items: List[tuple] = []
+        self._lock = Lock()
+
+    def add(self, torrent, content: bytes, add_params: dict, tracker_info: dict, volume_info: dict, started: float,
+            attempts: int = 0):
+        with self._lock:
+            self._items.append((torrent, content, add_params, tracker_info, volume_info, started, attempts))
+
+    def drain(self) -> List[tuple]:
+        with self._lock:
+            items, self._items = self._items, []
+        return items
+
+    def __len__(self) -> int:
+        return len(self._items)
 
 
 class QbReseedJump(_PluginBase):
@@ -42,6 +81,32 @@ class QbReseedJump(_PluginBase):
 
     _scheduler = None
     _event = Event()
+    _stats_lock = Lock()
+    # 统计数据结构版本
+    _stats_version = 3
+    _qb_sessions: Dict[str, QbApiSession] = {}
+    _qb_sessions_lock = Lock()
+    _sync_mirrors: Dict[str, QbSyncMirror] = {}
+    _rate_limiters: Dict[str, TokenBucketLimiter] = {}
+    _rate_limiters_lock = Lock()
+    _stats_cache: Optional[Dict] = None
+    # 运行互斥：同一时间只允许一次跳校任务，重叠的触发按策略跳过或排队
+    _run_state_lock = Lock()
+    _running = False
+    _run_pending = False
+    # 正在处理的种子：(下载器地址, hash)，避免同一种子被同时导出、删除
+    _inflight: Set[Tuple[str, str]] = set()
+    _inflight_lock = Lock()
+    # 正在处理的下载器：超时后不再等待的任务在线程真正退出前仍占用该下载器，下次运行跳过
+    _busy_downloaders: Set[str] = set()
+    _busy_lock = Lock()
+    # 自适应定时：连续未发现候选种子的次数，以及接下来需要跳过的定时次数
+    _idle_runs = 0
+    _skip_ticks = 0
+    # 历史数据重新映射任务
+    _remap_lock = Lock()
+    _remap_thread: Optional[Thread] = None
+    _remap_progress: Dict[str, Any] = {"state": "idle"}
 
     # 配置项
     _enabled = True
@@ -60,6 +125,49 @@ class QbReseedJump(_PluginBase):
     _processedcategory = ""              # 处理完成后加分类
     _tracker_mapping = ""                # tracker映射表
     _show_tracker_mapping = False        # 是否显示tracker映射页面
+    _concurrency = 1                     # 单个下载器同时处理的种子数
+    _downloader_timeout = 0              # 单个下载器处理时限（分钟），0为不限制
+    _batch_size = 1                      # 批量删除/添加的种子数，1为逐个处理
+    _backup_max_mb = 512                 # 种子备份容量上限（MB）
+    _backup_store: Optional[TorrentBackupStore] = None
+    _incremental_sync = False            # 基于 sync/maindata 增量获取候选种子
+    _excludetags = ""                    # 排除含这些标签的任务
+    _includesites = ""                   # 仅处理这些站点
+    _savepaths = ""                      # 仅处理这些保存路径下的任务
+    _sizerange = ""                      # 种子大小范围（GB）
+    _addeddays = 0                       # 仅处理添加超过N天的任务
+    _candidate_filter: Optional[CandidateFilter] = None
+    _site_resolver: Optional[TrackerSiteResolver] = None
+    _trace = False                       # 输出单个种子的处理细节
+    _trace_sample = 1                    # 每N个种子跟踪1个
+    _event_retention_days = 90           # 跳校事件日志保留天数
+    _overlap_policy = "skip"             # 上次任务未结束时再次触发：skip 跳过 / queue 结束后再执行一次
+    _adaptive = False                    # 自适应定时：无候选种子时逐步减少实际执行次数
+    _adaptive_max_skip = 16              # 自适应定时最多连续跳过的定时次数
+    _event_trigger = False               # 有新的下载任务时恢复正常定时
+    _rate_ops = 0.0                      # 每个下载器每秒最多处理的种子数，0为不限制
+    _rate_gb = 0.0                       # 每个下载器每秒最多处理的种子体积（GB），0为不限制
+    _stage_retries = 2                   # 删除、添加、确认每一步失败时的重试次数
+    _bt_backup_paths = ""                # 下载器名称:BT_backup目录，每行一个，配置后优先从本地读取种子文件
+    _file_check = "off"                  # 跳过校验前检查磁盘文件：off 不检查 / exclude 跳过异常种子 / recheck 异常种子改为重新校验
+    _file_check_workers = 8              # 检查磁盘文件的并发数
+    _path_mapping = ""                   # qB保存路径=>本地路径，每行一个，用于检查磁盘文件
+    _payload_checker: Optional[PayloadChecker] = None
+    # 本次运行中本地无法访问的保存路径，下载器名称 -> 路径，每个路径只警告一次
+    _unreachable_paths: Dict[str, Set[str]] = {}
+    # 以前磁盘文件检查未通过、本次特征变化后重新检查的种子：下载器名称 → {hash: 是否已重新校验}
+    _payload_retries: Dict[str, Dict[str, bool]] = {}
+    _event_store: Optional[ReseedEventStore] = None
+    _stats_store: Optional[ReseedStatsStore] = None
+    _state_store: Optional[ReseedStateStore] = None
+    # 未完成的种子跨运行最多重试次数
+    _resume_max_attempts = 5
+    # 批量预取的 tracker 地址，下载器名称 -> {hash: url}，仅在该下载器的单次运行内有效
+    _prefetched_trackers: Dict[str, Dict[str, str]] = {}
+    # 每次批量确认的种子数
+    _verify_batch_size = 100
+    # 重新添加后视为异常的任务状态
+    VERIFY_ERROR_STATES = frozenset({"error", "missingFiles", "unknown"})
 
     def init_plugin(self, config: dict = None):
         """初始化插件"""
@@ -91,16 +199,82 @@ class QbReseedJump(_PluginBase):
                 self._risk_confirmation = config.get("risk_confirmation", "")
                 self._processedcategory = config.get("processedcategory", "")
                 self._tracker_mapping = config.get("tracker_mapping", "")
+                self._concurrency = self._to_int(config.get("concurrency"), 1, minimum=1, maximum=16)
+                self._downloader_timeout = self._to_int(config.get("downloader_timeout"), 0, minimum=0)
+                self._batch_size = self._to_int(config.get("batch_size"), 1, minimum=1, maximum=200)
+                self._backup_max_mb = self._to_int(config.get("backup_max_mb"), 512, minimum=1)
+                self._incremental_sync = config.get("incremental_sync", False)
+                self._excludetags = config.get("excludetags", "")
+                self._includesites = config.get("includesites", "")
+                self._savepaths = config.get("savepaths", "")
+                self._sizerange = config.get("sizerange", "")
+                self._addeddays = self._to_int(config.get("addeddays"), 0, minimum=0)
+                self._trace = config.get("trace", False)
+                self._trace_sample = self._to_int(config.get("trace_sample"), 1, minimum=1)
+                self._event_retention_days = self._to_int(config.get("event_retention_days"), 90, minimum=1)
+                self._overlap_policy = "queue" if config.get("overlap_policy") == "queue" else "skip"
+                self._adaptive = config.get("adaptive", False)
+                self._adaptive_max_skip = self._to_int(config.get("adaptive_max_skip"), 16, minimum=1)
+                self._event_trigger = config.get("event_trigger", False)
+                self._rate_ops = self._to_float(config.get("rate_ops"), 0.0, minimum=0.0)
+                self._rate_gb = self._to_float(config.get("rate_gb"), 0.0, minimum=0.0)
+                self._stage_retries = self._to_int(config.get("stage_retries"), 2, minimum=0, maximum=5)
+                self._bt_backup_paths = config.get("bt_backup_paths", "")
+                self._file_check = config.get("file_check") if config.get("file_check") in ("exclude", "recheck") \
+                    else "off"
+                self._file_check_workers = self._to_int(config.get("file_check_workers"), 8, minimum=1, maximum=32)
+                self._path_mapping = config.get("path_mapping", "")
                 logger.info(f"加载tracker映射表: {len(self._tracker_mapping.split())} 条映射")
                 
                 # 保存配置（保存修改后的cron值）
                 self.__update_config()
 
-            # 数据存储已改为使用MoviePilot内置API，无需初始化文件
+            # 数据存储已改为使用MoviePilot内置API，无需初始化文件；统计数据在首次使用时重新加载
+            self._stats_cache = None
+            # 配置变化后自适应定时重新开始
+            self._idle_runs = 0
+            self._skip_ticks = 0
+
+            # 编译候选筛选条件
+            self._candidate_filter = self._build_candidate_filter()
+
+            # 关闭“删除导出的种子文件”时，导出的种子备份到插件数据目录
+            self._backup_store = None
+            if not self._delete_exported:
+                try:
+                    self._backup_store = TorrentBackupStore(path=self.get_data_path() / "torrents",
+                                                            max_bytes=self._backup_max_mb * 1024 * 1024)
+                except Exception as e:
+                    logger.error(f"初始化种子备份目录失败: {e}")
 
             # 停止现有任务
             self.stop_service()
 
+            # 跳校事件日志
+            try:
+                self._event_store = ReseedEventStore(path=self.get_data_path() / "events.db",
+                                                     retention_days=self._event_retention_days)
+            except Exception as e:
+                self._event_store = None
+                logger.error(f"初始化跳校事件日志失败: {e}")
+
+            # 统计时序数据（长期保留，按日/周/月降采样）
+            try:
+                self._stats_store = ReseedStatsStore(path=self.get_data_path() / "stats.db")
+            except Exception as e:
+                self._stats_store = None
+                logger.error(f"初始化统计时序数据失败: {e}")
+
+            # 检查磁盘文件的线程池（按需创建线程），续跑重新添加已不在下载器中的种子时始终检查
+            self._payload_checker = PayloadChecker(max_workers=self._file_check_workers)
+
+            # 跳校进度（中断或失败的种子下次运行继续处理）
+            try:
+                self._state_store = ReseedStateStore(path=self.get_data_path() / "state.db")
+            except Exception as e:
+                self._state_store = None
+                logger.error(f"初始化跳校进度记录失败: {e}")
+
             if self._enabled:
                 if self._onlyonce:
                     # 立即运行一次
@@ -117,23 +291,7 @@ class QbReseedJump(_PluginBase):
                         # 关闭一次性开关
                         self._onlyonce = False
                         # 保存配置
-                        self.update_config({
-                            "enabled": self._enabled,
-                            "notify": self._notify,
-                            "onlyonce": self._onlyonce,
-                            "cron": self._cron,
-                            "downloaders": self._downloaders,
-                            "pausedonly": self._pausedonly,
-                            "includetags": self._includetags,
-                            "includecategory": self._includecategory,
-                            "processedtag": self._processedtag,
-                            "processedcategory": self._processedcategory,
-                            "autostart": self._autostart,
-                            "remain_category": self._remain_category,
-                            "delete_exported": self._delete_exported,
-                            "risk_confirmation": self._risk_confirmation,
-                            "tracker_mapping": self._tracker_mapping
-                        })
+                        self.__update_config()
                     except Exception as e:
                         logger.error(f"启动定时任务失败: {e}")
                 elif self._cron:
@@ -149,7 +307,13 @@ class QbReseedJump(_PluginBase):
     @staticmethod
     def get_command() -> List[Dict[str, Any]]:
         """获取命令"""
-        pass
+        return [{
+            "cmd": "/qbreseedjump",
+            "event": EventType.PluginAction,
+            "desc": "QB跳校",
+            "category": "",
+            "data": {"action": "qbreseedjump"}
+        }]
 
     def get_api(self) -> List[Dict[str, Any]]:
         """获取API"""
@@ -173,7 +337,42 @@ class QbReseedJump(_PluginBase):
                 "endpoint": self.reprocess_historical_data,
                 "methods": ["GET"],
                 "summary": "重新处理历史数据",
-                "description": "根据当前映射表重新处理历史数据"
+                "description": "根据当前映射表在后台重新处理历史数据"
+            },
+            {
+                "path": "/reprocess_status",
+                "endpoint": self.reprocess_status,
+                "methods": ["GET"],
+                "summary": "历史数据处理进度",
+                "description": "查询重新处理历史数据任务的状态与进度"
+            },
+            {
+                "path": "/events",
+                "endpoint": self.query_events,
+                "methods": ["GET"],
+                "summary": "查询跳校事件",
+                "description": "按日期、下载器、结果、种子hash查询单个种子的跳校记录"
+            },
+            {
+                "path": "/stats_series",
+                "endpoint": self.query_stats_series,
+                "methods": ["GET"],
+                "summary": "查询统计时序数据",
+                "description": "按日期范围、下载器、站点查询长期统计，较早的数据按周/月汇总"
+            },
+            {
+                "path": "/pending_torrents",
+                "endpoint": self.pending_torrents,
+                "methods": ["GET"],
+                "summary": "未完成的跳校",
+                "description": "多次重试仍未完成、需要人工处理的种子"
+            },
+            {
+                "path": "/event_summary",
+                "endpoint": self.event_summary,
+                "methods": ["GET"],
+                "summary": "跳校事件汇总",
+                "description": "按日期范围汇总各下载器、站点的跳校数量与体积"
             }
         ]
 
@@ -186,7 +385,7 @@ class QbReseedJump(_PluginBase):
                         "id": "Qbreseedjump",
                         "name": "自动跳校服务",
                         "trigger": CronTrigger.from_crontab(self._cron),
-                        "func": self.reseed_all,
+                        "func": self._scheduled_reseed if self._adaptive else self.reseed_all,
                         "kwargs": {}
                     }]
                 else:
@@ -369,7 +568,12 @@ class QbReseedJump(_PluginBase):
                                 'props': {'cols': 12, 'md': 3},
                                 'content': [{
                                     'component': 'VSwitch',
-                                    'props': {'model': 'delete_exported', 'label': '删除导出的种子文件'}
+                                    'props': {
+                                        'model': 'delete_exported',
+                                        'label': '删除导出的种子文件',
+                                        'hint': '关闭后导出的种子备份到插件数据目录',
+                                        'persistent-hint': True
+                                    }
                                 }]
                             }
                         ]
@@ -379,10 +583,69 @@ class QbReseedJump(_PluginBase):
                         'content': [
                             {
                                 'component': 'VCol',
-                                'props': {'cols': 12, 'md': 6},
+                                'props': {'cols': 12, 'md': 3},
+                                'content': [{
+                                    'component': 'VSwitch',
+                                    'props': {
+                                        'model': 'incremental_sync',
+                                        'label': '增量获取种子',
+                                        'hint': '只检查上次运行后发生变化的种子，适合短周期定时',
+                                        'persistent-hint': True
+                                    }
+                                }]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {'cols': 12, 'md': 3},
+                                'content': [{
+                                    'component': 'VSwitch',
+                                    'props': {
+                                        'model': 'adaptive',
+                                        'label': '自适应定时',
+                                        'hint': '连续未发现候选种子时逐步减少实际执行次数，发现后恢复',
+                                        'persistent-hint': True
+                                    }
+                                }]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {'cols': 12, 'md': 3},
+                                'content': [{
+                                    'component': 'VSwitch',
+                                    'props': {
+                                        'model': 'event_trigger',
+                                        'label': '新任务时恢复定时',
+                                        'hint': '有新的下载任务时，自适应定时立即恢复为每次执行',
+                                        'persistent-hint': True
+                                    }
+                                }]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {'cols': 12, 'md': 3},
                                 'content': [{
                                     'component': 'VTextField',
-                                    'props': {'model': 'includetags', 'label': '仅处理含这些标签(,分隔)'}
+                                    'props': {
+                                        'model': 'adaptive_max_skip',
+                                        'label': '最多跳过定时次数',
+                                        'type': 'number',
+                                        'placeholder': '16',
+                                        'hint': '自适应定时连续跳过的上限',
+                                        'persistent-hint': True
+                                    }
+                                }]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {'cols': 12, 'md': 3},
+                                'content': [{
+                                    'component': 'VSwitch',
+                                    'props': {
+                                        'model': 'trace',
+                                        'label': '输出种子处理细节',
+                                        'hint': '用于排查问题，关闭时每个下载器只输出一行汇总',
+                                        'persistent-hint': True
+                                    }
                                 }]
                             },
                             {
@@ -390,7 +653,14 @@ class QbReseedJump(_PluginBase):
                                 'props': {'cols': 12, 'md': 6},
                                 'content': [{
                                     'component': 'VTextField',
-                                    'props': {'model': 'includecategory', 'label': '仅处理这些分类(,分隔)'}
+                                    'props': {
+                                        'model': 'trace_sample',
+                                        'label': '处理细节抽样',
+                                        'type': 'number',
+                                        'placeholder': '1',
+                                        'hint': '每N个种子输出1个的处理细节，1为全部输出',
+                                        'persistent-hint': True
+                                    }
                                 }]
                             }
                         ]
@@ -403,7 +673,14 @@ class QbReseedJump(_PluginBase):
                                 'props': {'cols': 12, 'md': 6},
                                 'content': [{
                                     'component': 'VTextField',
-                                    'props': {'model': 'processedtag', 'label': '处理完成后打标签'}
+                                    'props': {
+                                        'model': 'concurrency',
+                                        'label': '并发处理数',
+                                        'type': 'number',
+                                        'placeholder': '1',
+                                        'hint': '单个下载器同时处理的种子数（1-16），1为逐个处理',
+                                        'persistent-hint': True
+                                    }
                                 }]
                             },
                             {
@@ -411,75 +688,363 @@ class QbReseedJump(_PluginBase):
                                 'props': {'cols': 12, 'md': 6},
                                 'content': [{
                                     'component': 'VTextField',
-                                    'props': {'model': 'processedcategory', 'label': '处理完成后加分类'}
+                                    'props': {
+                                        'model': 'downloader_timeout',
+                                        'label': '单个下载器处理时限（分钟）',
+                                        'type': 'number',
+                                        'placeholder': '0',
+                                        'hint': '超时后该下载器不再处理新的种子，不影响其他下载器；0为不限制',
+                                        'persistent-hint': True
+                                    }
                                 }]
-                            }
-                        ]
-                    },
-                    {
-                        'component': 'VRow',
-                        'content': [
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {'cols': 12, 'md': 6},
+                                'content': [{
+                                    'component': 'VTextField',
+                                    'props': {
+                                        'model': 'batch_size',
+                                        'label': '批量处理数',
+                                        'type': 'number',
+                                        'placeholder': '1',
+                                        'hint': '保存路径与分类相同的种子合并为一次删除、一次添加（1-200），1为逐个处理',
+                                        'persistent-hint': True
+                                    }
+                                }]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {'cols': 12, 'md': 6},
+                                'content': [{
+                                    'component': 'VTextField',
+                                    'props': {
+                                        'model': 'rate_ops',
+                                        'label': '每秒处理种子数',
+                                        'type': 'number',
+                                        'placeholder': '0',
+                                        'hint': '每个下载器的删除/添加速率上限，可填小数；下载器变慢或出错时自动降速；0为不限制',
+                                        'persistent-hint': True
+                                    }
+                                }]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {'cols': 12, 'md': 6},
+                                'content': [{
+                                    'component': 'VTextField',
+                                    'props': {
+                                        'model': 'rate_gb',
+                                        'label': '每秒处理体积（GB）',
+                                        'type': 'number',
+                                        'placeholder': '0',
+                                        'hint': '每个下载器每秒重新添加的种子总体积上限，避免跳过校验的大种子集中添加；0为不限制',
+                                        'persistent-hint': True
+                                    }
+                                }]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {'cols': 12, 'md': 6},
+                                'content': [{
+                                    'component': 'VTextField',
+                                    'props': {
+                                        'model': 'stage_retries',
+                                        'label': '失败重试次数',
+                                        'type': 'number',
+                                        'placeholder': '2',
+                                        'hint': '删除、添加、确认每一步失败时的重试次数（0-5）；仍失败的种子保留种子文件，下次运行继续',
+                                        'persistent-hint': True
+                                    }
+                                }]
+                            },
                             {
                                 'component': 'VCol',
                                 'props': {'cols': 12},
-                                'content': [
-                                    {
-                                        'component': 'div',
-                                        'props': {'class': 'text-caption mb-2'},
-                                        'content': [
-                                            {
-                                                'component': 'span',
-                                                'text': '请确保完整填写：'
-                                            },
-                                            {
-                                                'component': 'span',
-                                                'props': {'style': 'font-weight: bold; color: red;'},
-                                                'text': '我已知晓跳校可能带来的所有不良后果，且不会因此迁怒开发者'
-                                            },
-                                            {
-                                                'component': 'span',
-                                                'text': '（PS：实在生气可以骂AI，这句不用填）'
-                                            }
+                                'content': [{
+                                    'component': 'VTextarea',
+                                    'props': {
+                                        'model': 'bt_backup_paths',
+                                        'label': 'BT_backup目录',
+                                        'rows': 2,
+                                        'placeholder': 'qbittorrent:/qbittorrent/config/qBittorrent/BT_backup',
+                                        'hint': '与qBittorrent共享文件系统时，每行一个“下载器名称:BT_backup目录”，直接读取本地种子文件；'
+                                                '文件不存在或不含tracker时仍通过接口导出',
+                                        'persistent-hint': True
+                                    }
+                                }]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {'cols': 12, 'md': 6},
+                                'content': [{
+                                    'component': 'VTextField',
+                                    'props': {
+                                        'model': 'backup_max_mb',
+                                        'label': '种子备份容量上限（MB）',
+                                        'type': 'number',
+                                        'placeholder': '512',
+                                        'hint': '仅在关闭“删除导出的种子文件”时生效，超出后自动删除最早的备份',
+                                        'persistent-hint': True
+                                    }
+                                }]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {'cols': 12, 'md': 6},
+                                'content': [{
+                                    'component': 'VTextField',
+                                    'props': {
+                                        'model': 'event_retention_days',
+                                        'label': '跳校记录保留天数',
+                                        'type': 'number',
+                                        'placeholder': '90',
+                                        'hint': '每个种子的跳校结果记录在插件数据目录的 events.db 中',
+                                        'persistent-hint': True
+                                    }
+                                }]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {'cols': 12, 'md': 6},
+                                'content': [{
+                                    'component': 'VSelect',
+                                    'props': {
+                                        'model': 'overlap_policy',
+                                        'label': '任务重叠时',
+                                        'items': [
+                                            {'title': '跳过本次触发', 'value': 'skip'},
+                                            {'title': '上次结束后再执行一次', 'value': 'queue'}
                                         ],
-                                        'attrs': {
-                                            'title': '如果非要迁怒，可以尽情的把怒火发泄给AI，谢谢！'
-                                        }
-                                    },
-                                    {
-                                        'component': 'VTextField',
-                                        'props': {
-                                            'model': 'risk_confirmation',
-                                            'label': '风险确认（必填）',
-                                            'placeholder': '我已知晓跳校可能带来的所有不良后果，且不会因此迁怒开发者',
-                                            'required': True,
-                                            'rules': [
-                                                {
-                                                    'required': True,
-                                                    'message': '请填写完整的风险确认文本',
-                                                    'validator': lambda v: v and v.strip() == '我已知晓跳校可能带来的所有不良后果，且不会因此迁怒开发者'
-                                                }
-                                            ]
-                                        }
-                                    },
-                                    {
-                                        'component': 'VTextField',
-                                        'props': {
-                                            'model': 'tracker_mapping',
-                                            'label': 'Tracker映射表（隐藏）',
-                                            'style': 'display: none;'
-                                        }
+                                        'hint': '上一次跳校任务尚未结束时又被触发的处理方式',
+                                        'persistent-hint': True
                                     }
-                                ]
+                                }]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {'cols': 12, 'md': 6},
+                                'content': [{
+                                    'component': 'VSelect',
+                                    'props': {
+                                        'model': 'file_check',
+                                        'label': '检查磁盘文件',
+                                        'items': [
+                                            {'title': '不检查', 'value': 'off'},
+                                            {'title': '跳过文件异常的种子', 'value': 'exclude'},
+                                            {'title': '文件异常的种子改为重新校验', 'value': 'recheck'}
+                                        ],
+                                        'hint': '跳过校验前按种子文件列表检查磁盘上的文件是否存在且大小一致',
+                                        'persistent-hint': True
+                                    }
+                                }]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {'cols': 12, 'md': 6},
+                                'content': [{
+                                    'component': 'VTextField',
+                                    'props': {
+                                        'model': 'file_check_workers',
+                                        'label': '检查磁盘文件并发数',
+                                        'type': 'number',
+                                        'placeholder': '8',
+                                        'hint': '同时扫描的目录数（1-32）',
+                                        'persistent-hint': True
+                                    }
+                                }]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {'cols': 12},
+                                'content': [{
+                                    'component': 'VTextarea',
+                                    'props': {
+                                        'model': 'path_mapping',
+                                        'label': '保存路径映射',
+                                        'rows': 2,
+                                        'placeholder': '/downloads=>/media/downloads',
+                                        'hint': 'qBittorrent与MoviePilot看到的路径不同时，每行一个“qB保存路径=>本地路径”，用于检查磁盘文件',
+                                        'persistent-hint': True
+                                    }
+                                }]
                             }
                         ]
                     },
-                    # Tracker映射配置区域
                     {
                         'component': 'VRow',
                         'content': [
                             {
                                 'component': 'VCol',
-                                'props': {'cols': 12},
+                                'props': {'cols': 12, 'md': 6},
+                                'content': [{
+                                    'component': 'VTextField',
+                                    'props': {'model': 'includetags', 'label': '仅处理含这些标签(,分隔)'}
+                                }]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {'cols': 12, 'md': 6},
+                                'content': [{
+                                    'component': 'VTextField',
+                                    'props': {'model': 'includecategory', 'label': '仅处理这些分类(,分隔)'}
+                                }]
+                            }
+                        ]
+                    },
+                    {
+                        'component': 'VRow',
+                        'content': [
+                            {
+                                'component': 'VCol',
+                                'props': {'cols': 12, 'md': 6},
+                                'content': [{
+                                    'component': 'VTextField',
+                                    'props': {'model': 'excludetags', 'label': '排除含这些标签(,分隔)'}
+                                }]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {'cols': 12, 'md': 6},
+                                'content': [{
+                                    'component': 'VTextField',
+                                    'props': {
+                                        'model': 'includesites',
+                                        'label': '仅处理这些站点(,分隔)',
+                                        'hint': '站点名称与Tracker映射表一致',
+                                        'persistent-hint': True
+                                    }
+                                }]
+                            }
+                        ]
+                    },
+                    {
+                        'component': 'VRow',
+                        'content': [
+                            {
+                                'component': 'VCol',
+                                'props': {'cols': 12, 'md': 6},
+                                'content': [{
+                                    'component': 'VTextField',
+                                    'props': {'model': 'savepaths', 'label': '仅处理这些保存路径下的任务(,分隔)'}
+                                }]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {'cols': 12, 'md': 3},
+                                'content': [{
+                                    'component': 'VTextField',
+                                    'props': {
+                                        'model': 'sizerange',
+                                        'label': '种子大小（GB）',
+                                        'placeholder': '10-100',
+                                        'hint': '10 表示不小于10GB，10-100 表示10GB到100GB之间',
+                                        'persistent-hint': True
+                                    }
+                                }]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {'cols': 12, 'md': 3},
+                                'content': [{
+                                    'component': 'VTextField',
+                                    'props': {
+                                        'model': 'addeddays',
+                                        'label': '添加超过天数',
+                                        'type': 'number',
+                                        'placeholder': '0',
+                                        'hint': '仅处理添加超过N天的任务，0为不限制',
+                                        'persistent-hint': True
+                                    }
+                                }]
+                            }
+                        ]
+                    },
+                    {
+                        'component': 'VRow',
+                        'content': [
+                            {
+                                'component': 'VCol',
+                                'props': {'cols': 12, 'md': 6},
+                                'content': [{
+                                    'component': 'VTextField',
+                                    'props': {'model': 'processedtag', 'label': '处理完成后打标签'}
+                                }]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {'cols': 12, 'md': 6},
+                                'content': [{
+                                    'component': 'VTextField',
+                                    'props': {'model': 'processedcategory', 'label': '处理完成后加分类'}
+                                }]
+                            }
+                        ]
+                    },
+                    {
+                        'component': 'VRow',
+                        'content': [
+                            {
+                                'component': 'VCol',
+                                'props': {'cols': 12},
+                                'content': [
+                                    {
+                                        'component': 'div',
+                                        'props': {'class': 'text-caption mb-2'},
+                                        'content': [
+                                            {
+                                                'component': 'span',
+                                                'text': '请确保完整填写：'
+                                            },
+                                            {
+                                                'component': 'span',
+                                                'props': {'style': 'font-weight: bold; color: red;'},
+                                                'text': '我已知晓跳校可能带来的所有不良后果，且不会因此迁怒开发者'
+                                            },
+                                            {
+                                                'component': 'span',
+                                                'text': '（PS：实在生气可以骂AI，这句不用填）'
+                                            }
+                                        ],
+                                        'attrs': {
+                                            'title': '如果非要迁怒，可以尽情的把怒火发泄给AI，谢谢！'
+                                        }
+                                    },
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'risk_confirmation',
+                                            'label': '风险确认（必填）',
+                                            'placeholder': '我已知晓跳校可能带来的所有不良后果，且不会因此迁怒开发者',
+                                            'required': True,
+                                            'rules': [
+                                                {
+                                                    'required': True,
+                                                    'message': '请填写完整的风险确认文本',
+                                                    'validator': lambda v: v and v.strip() == '我已知晓跳校可能带来的所有不良后果，且不会因此迁怒开发者'
+                                                }
+                                            ]
+                                        }
+                                    },
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'tracker_mapping',
+                                            'label': 'Tracker映射表（隐藏）',
+                                            'style': 'display: none;'
+                                        }
+                                    }
+                                ]
+                            }
+                        ]
+                    },
+                    # Tracker映射配置区域
+                    {
+                        'component': 'VRow',
+                        'content': [
+                            {
+                                'component': 'VCol',
+                                'props': {'cols': 12},
                                 'content': [
                                     {
                                         'component': 'VCard',
@@ -495,7 +1060,7 @@ class QbReseedJump(_PluginBase):
                                                     {
                                                         'component': 'div',
                                                         'props': {'class': 'text-caption text-grey mb-2'},
-                                                        'text': '每行一个映射，格式：tracker域名:站点名称。保存后会自动重新处理历史数据。'
+                                                        'text': '每行一个映射，格式：tracker域名:站点名称。统计数据按tracker域名记录，保存后立即按新映射显示。'
                                                     },
                                                     {
                                                         'component': 'VTextarea',
@@ -525,11 +1090,22 @@ class QbReseedJump(_PluginBase):
                                                                                 const apiKey = {js_safe_api_token};
                                                                                 const response = await fetch('/api/v1/plugin/QbReseedJump/reprocess_historical_data?apikey=' + encodeURIComponent(apiKey));
                                                                                 const result = await response.json();
-                                                                                if (result.success) {{
-                                                                                    alert('历史数据重新处理完成！');
+                                                                                if (!result.success) {{
+                                                                                    alert('重新处理失败：' + result.message);
+                                                                                    return;
+                                                                                }}
+                                                                                // 后台处理，轮询进度
+                                                                                let progress = result.data || {{}};
+                                                                                while (!['done', 'failed'].includes(progress.state)) {{
+                                                                                    await new Promise(resolve => setTimeout(resolve, 1000));
+                                                                                    const status = await fetch('/api/v1/plugin/QbReseedJump/reprocess_status?apikey=' + encodeURIComponent(apiKey));
+                                                                                    progress = (await status.json()).data || {{}};
+                                                                                }}
+                                                                                if (progress.state === 'done') {{
+                                                                                    alert('历史数据重新处理完成！更新了 ' + progress.changed + ' 个数据桶');
                                                                                     location.reload();
                                                                                 }} else {{
-                                                                                    alert('重新处理失败：' + result.message);
+                                                                                    alert('重新处理失败：' + progress.error);
                                                                                 }}
                                                                             }} catch (error) {{
                                                                                 alert('请求失败：' + error.message);
@@ -598,6 +1174,30 @@ class QbReseedJump(_PluginBase):
             "remain_category": True,
         "delete_exported": True,
         "risk_confirmation": "",
+        "concurrency": 1,
+        "downloader_timeout": 0,
+        "batch_size": 1,
+        "backup_max_mb": 512,
+        "incremental_sync": False,
+        "excludetags": "",
+        "includesites": "",
+        "savepaths": "",
+        "sizerange": "",
+        "addeddays": 0,
+        "trace": False,
+        "trace_sample": 1,
+        "event_retention_days": 90,
+        "overlap_policy": "skip",
+        "adaptive": False,
+        "adaptive_max_skip": 16,
+        "event_trigger": False,
+        "rate_ops": 0,
+        "rate_gb": 0,
+        "stage_retries": 2,
+        "bt_backup_paths": "",
+        "file_check": "off",
+        "file_check_workers": 8,
+        "path_mapping": "",
         "tracker_mapping": "agsvpt.trackers.work:末日\ntracker.agsvpt.work:末日\ntracker.agsvpt.cn:末日\ntracker.carpt.net:车站\ntracker.cyanbug.net:大青虫\ntracker.greatposterwall.com:海豹\ntracker.ilolicon.cc:萝莉\ntracker01.ilovelemonhd.me:柠檬\nourbits.club:我堡\npt.ourhelp.club:我堡\nptl.gs:劳改所\nrelay01.ptl.gs:8443:劳改所\nrousi.zip:肉丝\ntracker.rousipt.com:肉丝\ntracker.yemapt.org:野马\npt.gtk.pw:GTK\nwww.pttime.org:PTT\nnextpt.net:FSM\nconnects.icu:FSM\npt.gtkpw.xyz:GTK\ntracker.ptchdbits.co:彩虹岛\ntracker.rainbowisland.co:彩虹岛\nchdbits.xyz:彩虹岛\nzmpt.cc:织梦\nzmpt.club:织梦\ntracker.hdsky.me:天空\ntra1.m-team.cc:馒头\ntracker.pterclub.com:猫站\nhdfans.org:红豆饭\non.springsunday.net:春天\ntracker.totheglory.im:套套哥\nt.hddolby.com:高清杜比\nt.audiences.me:观众\ntracker.piggo.me:猪猪\ntracker.hdarea.club:高清视界"
         }
 
@@ -642,9 +1242,57 @@ class QbReseedJump(_PluginBase):
             "remain_category": self._remain_category,
             "delete_exported": self._delete_exported,
             "risk_confirmation": self._risk_confirmation,
-            "tracker_mapping": self._tracker_mapping
+            "tracker_mapping": self._tracker_mapping,
+            "concurrency": self._concurrency,
+            "downloader_timeout": self._downloader_timeout,
+            "batch_size": self._batch_size,
+            "backup_max_mb": self._backup_max_mb,
+            "incremental_sync": self._incremental_sync,
+            "excludetags": self._excludetags,
+            "includesites": self._includesites,
+            "savepaths": self._savepaths,
+            "sizerange": self._sizerange,
+            "addeddays": self._addeddays,
+            "trace": self._trace,
+            "trace_sample": self._trace_sample,
+            "event_retention_days": self._event_retention_days,
+            "overlap_policy": self._overlap_policy,
+            "adaptive": self._adaptive,
+            "adaptive_max_skip": self._adaptive_max_skip,
+            "event_trigger": self._event_trigger,
+            "rate_ops": self._rate_ops,
+            "rate_gb": self._rate_gb,
+            "stage_retries": self._stage_retries,
+            "bt_backup_paths": self._bt_backup_paths,
+            "file_check": self._file_check,
+            "file_check_workers": self._file_check_workers,
+            "path_mapping": self._path_mapping
         })
 
+    @staticmethod
+    def _to_int(value: Any, default: int, minimum: int = None, maximum: int = None) -> int:
+        """将配置值转换为整数并限制范围"""
+        try:
+            result = int(str(value).strip())
+        except (TypeError, ValueError):
+            result = default
+        if minimum is not None:
+            result = max(minimum, result)
+        if maximum is not None:
+            result = min(maximum, result)
+        return result
+
+    @staticmethod
+    def _to_float(value: Any, default: float, minimum: float = None) -> float:
+        """将配置值转换为浮点数并限制下限"""
+        try:
+            result = float(str(value).strip())
+        except (TypeError, ValueError):
+            result = default
+        if minimum is not None:
+            result = max(minimum, result)
+        return result
+
     def stop_service(self):
         """停止服务"""
         try:
@@ -676,32 +1324,20 @@ class QbReseedJump(_PluginBase):
             
             # 获取今日日期
             today = date.today().strftime("%Y-%m-%d")
-            
-            # 计算今日统计
-            total_today = 0
-            volume_today = 0
-            if today in stats.get("daily", {}):
-                for downloader, data in stats["daily"][today].items():
-                    total_today += data.get("success", 0) + data.get("failed", 0)
-                    if "volumes" in data:
-                        logger.info(f"今日 {downloader} 体积数据: {data['volumes']}")
-                        for tracker, volume in data["volumes"].items():
-                            volume_today += volume
-                    else:
-                        logger.info(f"今日 {downloader} 没有体积数据")
-            
-            # 计算累计统计
-            total_all = 0
-            volume_all = 0
-            if stats.get("total"):
-                for downloader, data in stats["total"].items():
-                    total_all += data.get("success", 0) + data.get("failed", 0)
-                    if "volumes" in data:
-                        logger.info(f"累计 {downloader} 体积数据: {data['volumes']}")
-                        for tracker, volume in data["volumes"].items():
-                            volume_all += volume
-                    else:
-                        logger.info(f"累计 {downloader} 没有体积数据")
+
+            # 今日与累计统计直接取汇总数据
+            rollup = stats.get("rollup") or self._empty_rollup()
+            today_rollup = rollup["daily"].get(today) or {}
+            total_rollup = rollup["total"]
+            total_today = today_rollup.get("count", 0)
+            volume_today = today_rollup.get("volume", 0)
+            total_all = total_rollup.get("count", 0)
+            volume_all = total_rollup.get("volume", 0)
+            # 统计键为tracker host（旧数据为站点名称），展示前按当前映射表合并为站点名称
+            today_sites = {field: self._group_by_site_name(today_rollup.get(field))
+                           for field in ("trackers", "volumes")}
+            total_sites = {field: self._group_by_site_name(total_rollup.get(field))
+                           for field in ("trackers", "volumes")}
             
             # 格式化体积显示
             def format_size(size_bytes):
@@ -712,8 +1348,6 @@ class QbReseedJump(_PluginBase):
                 else:
                     return f"{size_bytes / (1024 * 1024 * 1024 * 1024):.1f}TB"
             
-            logger.info(f"体积统计 - 今日: {volume_today} bytes, 累计: {volume_all} bytes")
-            
             # 构建顶部统计卡片
             stat_cards = [
                 # 今日跳校数
@@ -938,19 +1572,10 @@ class QbReseedJump(_PluginBase):
             chart_elements = []
             
             # 今日各站点跳校数占比饼状图
-            if today in stats.get("daily", {}):
-                tracker_count_data = []
-                tracker_count_labels = []
-                for downloader, data in stats["daily"][today].items():
-                    if "trackers" in data:
-                        for tracker, count in data["trackers"].items():
-                            if tracker in tracker_count_labels:
-                                idx = tracker_count_labels.index(tracker)
-                                tracker_count_data[idx] += count
-                            else:
-                                tracker_count_labels.append(tracker)
-                                tracker_count_data.append(count)
-                
+            if today_rollup:
+                tracker_count_labels = list(today_sites["trackers"].keys())
+                tracker_count_data = list(today_sites["trackers"].values())
+
                 if tracker_count_data:
                     chart_elements.append({
                         'component': 'VCol',
@@ -987,19 +1612,10 @@ class QbReseedJump(_PluginBase):
                     })
             
             # 今日各站点跳校体积占比饼状图
-            if today in stats.get("daily", {}):
-                tracker_volume_data = []
-                tracker_volume_labels = []
-                for downloader, data in stats["daily"][today].items():
-                    if "volumes" in data:
-                        for tracker, volume in data["volumes"].items():
-                            if tracker in tracker_volume_labels:
-                                idx = tracker_volume_labels.index(tracker)
-                                tracker_volume_data[idx] += volume
-                            else:
-                                tracker_volume_labels.append(tracker)
-                                tracker_volume_data.append(volume)
-                
+            if today_rollup:
+                tracker_volume_labels = list(today_sites["volumes"].keys())
+                tracker_volume_data = list(today_sites["volumes"].values())
+
                 if tracker_volume_data:
                     # 转换体积数据为GB显示
                     volume_data_gb = [v / (1024 * 1024 * 1024) for v in tracker_volume_data]
@@ -1038,19 +1654,10 @@ class QbReseedJump(_PluginBase):
                     })
             
             # 总各站点跳校数占比饼状图
-            if stats.get("total"):
-                total_tracker_count_data = []
-                total_tracker_count_labels = []
-                for downloader, data in stats["total"].items():
-                    if "trackers" in data:
-                        for tracker, count in data["trackers"].items():
-                            if tracker in total_tracker_count_labels:
-                                idx = total_tracker_count_labels.index(tracker)
-                                total_tracker_count_data[idx] += count
-                            else:
-                                total_tracker_count_labels.append(tracker)
-                                total_tracker_count_data.append(count)
-                
+            if total_rollup.get("count"):
+                total_tracker_count_labels = list(total_sites["trackers"].keys())
+                total_tracker_count_data = list(total_sites["trackers"].values())
+
                 if total_tracker_count_data:
                     chart_elements.append({
                         'component': 'VCol',
@@ -1087,19 +1694,10 @@ class QbReseedJump(_PluginBase):
                     })
             
             # 总各站点跳校体积占比饼状图
-            if stats.get("total"):
-                total_tracker_volume_data = []
-                total_tracker_volume_labels = []
-                for downloader, data in stats["total"].items():
-                    if "volumes" in data:
-                        for tracker, volume in data["volumes"].items():
-                            if tracker in total_tracker_volume_labels:
-                                idx = total_tracker_volume_labels.index(tracker)
-                                total_tracker_volume_data[idx] += volume
-                            else:
-                                total_tracker_volume_labels.append(tracker)
-                                total_tracker_volume_data.append(volume)
-                
+            if total_rollup.get("count"):
+                total_tracker_volume_labels = list(total_sites["volumes"].keys())
+                total_tracker_volume_data = list(total_sites["volumes"].values())
+
                 if total_tracker_volume_data:
                     # 转换体积数据为GB显示
                     total_volume_data_gb = [v / (1024 * 1024 * 1024) for v in total_tracker_volume_data]
@@ -1159,70 +1757,104 @@ class QbReseedJump(_PluginBase):
                 }
             ]
 
+    def _empty_stats(self) -> Dict:
+        """空统计数据"""
+        return {"version": self._stats_version, "daily": {}, "total": {}, "rollup": self._empty_rollup()}
+
+    @staticmethod
+    def _empty_rollup() -> Dict:
+        """汇总数据：每日合计与累计合计，均含各站点的数量与体积"""
+        return {"daily": {}, "total": {"count": 0, "volume": 0, "trackers": {}, "volumes": {}}}
+
+    @staticmethod
+    def _rollup_add(bucket: Dict, count: int, tracker_info: dict = None, volume_info: dict = None):
+        """向汇总桶中累加，只涉及本次变化的站点"""
+        bucket["count"] = bucket.get("count", 0) + count
+        trackers = bucket.setdefault("trackers", {})
+        for tracker, tracker_count in (tracker_info or {}).items():
+            trackers[tracker] = trackers.get(tracker, 0) + tracker_count
+        volumes = bucket.setdefault("volumes", {})
+        for tracker, volume in (volume_info or {}).items():
+            volumes[tracker] = volumes.get(tracker, 0) + volume
+            bucket["volume"] = bucket.get("volume", 0) + volume
+
+    def _rebuild_rollups(self, stats: Dict):
+        """根据各下载器明细重新生成汇总数据"""
+        rollup = self._empty_rollup()
+        for date_key, date_data in stats.get("daily", {}).items():
+            day = rollup["daily"].setdefault(date_key, {"count": 0, "volume": 0, "trackers": {}, "volumes": {}})
+            for data in date_data.values():
+                self._rollup_add(day, data.get("success", 0) + data.get("failed", 0),
+                                 data.get("trackers"), data.get("volumes"))
+        for data in stats.get("total", {}).values():
+            self._rollup_add(rollup["total"], data.get("success", 0) + data.get("failed", 0),
+                             data.get("trackers"), data.get("volumes"))
+        stats["rollup"] = rollup
+
     def _load_stats(self) -> Dict:
-        """加载统计数据"""
+        """加载统计数据，旧版本数据在首次加载时迁移一次，之后读取不做任何写入。
+        加载后缓存在内存中，所有更新都在 _stats_lock 内修改同一份数据，并发更新不会互相覆盖"""
+        stats = self._stats_cache
+        if stats is not None:
+            return stats
+        with self._stats_lock:
+            return self.__cached_stats()
+
+    def __cached_stats(self) -> Dict:
+        """在 _stats_lock 内调用：返回缓存的统计数据，尚未加载时从插件数据加载并缓存"""
+        if self._stats_cache is not None:
+            return self._stats_cache
         try:
             stats = self.get_data("stats")
             if not stats:
-                return {"daily": {}, "total": {}}
+                stats = self._empty_stats()
             # 确保数据结构完整
             if "daily" not in stats:
                 stats["daily"] = {}
             if "total" not in stats:
                 stats["total"] = {}
-            
-            # 清理历史数据中的"未知站点"
-            self._clean_unknown_sites(stats)
-            
-            return stats
+
+            if stats.get("version", 0) < self._stats_version:
+                self._migrate_stats(stats)
         except Exception as e:
             logger.error(f"加载统计数据失败: {e}")
-            return {"daily": {}, "total": {}}
-
-    def _clean_unknown_sites(self, stats: Dict):
-        """清理历史数据中的未知站点"""
-        try:
-            logger.info("开始清理历史数据中的未知站点")
-            cleaned_count = 0
-            
-            # 清理每日数据中的未知站点
+            return self._empty_stats()
+        self._stats_cache = stats
+        return stats
+
+    def _migrate_stats(self, stats: Dict):
+        """统计数据结构迁移，完成后写入版本号，在 _stats_lock 内调用"""
+        version = stats.get("version", 0)
+        if version < 1:
+            # 清理历史数据中的"未知站点"
+            self._clean_unknown_sites(stats)
+        if version < 2:
+            # 生成汇总数据
+            self._rebuild_rollups(stats)
+        if version < 3 and self._stats_store and self._stats_store.is_empty():
+            # 将近30天的每日数据导入统计时序表
             for date_key, date_data in stats.get("daily", {}).items():
-                for downloader_name, downloader_data in date_data.items():
-                    # 清理trackers中的未知站点
-                    if "trackers" in downloader_data and "未知站点" in downloader_data["trackers"]:
-                        del downloader_data["trackers"]["未知站点"]
-                        cleaned_count += 1
-                        logger.info(f"清理每日数据中的未知站点: {date_key} - {downloader_name}")
-                    
-                    # 清理volumes中的未知站点
-                    if "volumes" in downloader_data and "未知站点" in downloader_data["volumes"]:
-                        del downloader_data["volumes"]["未知站点"]
-                        cleaned_count += 1
-                        logger.info(f"清理每日数据中的未知站点体积: {date_key} - {downloader_name}")
-            
-            # 清理累计数据中的未知站点
-            for downloader_name, downloader_data in stats.get("total", {}).items():
-                # 清理trackers中的未知站点
-                if "trackers" in downloader_data and "未知站点" in downloader_data["trackers"]:
-                    del downloader_data["trackers"]["未知站点"]
-                    cleaned_count += 1
-                    logger.info(f"清理累计数据中的未知站点: {downloader_name}")
-                
-                # 清理volumes中的未知站点
-                if "volumes" in downloader_data and "未知站点" in downloader_data["volumes"]:
-                    del downloader_data["volumes"]["未知站点"]
+                for downloader, data in date_data.items():
+                    self._stats_store.add(date_key, downloader, data.get("success", 0), data.get("failed", 0),
+                                          data.get("trackers"), data.get("volumes"))
+        stats["version"] = self._stats_version
+        self._save_stats(stats)
+        logger.info(f"统计数据已从版本 {version} 迁移到版本 {self._stats_version}")
+
+    @staticmethod
+    def _clean_unknown_sites(stats: Dict) -> int:
+        """清理历史数据中的未知站点，返回清理的记录数"""
+        cleaned_count = 0
+        buckets = [downloader_data for date_data in stats.get("daily", {}).values()
+                   for downloader_data in date_data.values()]
+        buckets.extend(stats.get("total", {}).values())
+        for downloader_data in buckets:
+            for key in ("trackers", "volumes"):
+                if "未知站点" in downloader_data.get(key, {}):
+                    del downloader_data[key]["未知站点"]
                     cleaned_count += 1
-                    logger.info(f"清理累计数据中的未知站点体积: {downloader_name}")
-            
-            logger.info(f"清理完成，共清理了 {cleaned_count} 个未知站点记录")
-            
-            # 保存清理后的数据
-            if cleaned_count > 0:
-                self._save_stats(stats)
-                logger.info("已保存清理后的统计数据")
-            
-        except Exception as e:
-            logger.error(f"清理未知站点失败: {e}")
+        logger.info(f"清理完成，共清理了 {cleaned_count} 个未知站点记录")
+        return cleaned_count
 
     def _save_stats(self, stats: Dict):
         """保存统计数据"""
@@ -1231,73 +1863,34 @@ class QbReseedJump(_PluginBase):
         except Exception as e:
             logger.error(f"保存统计数据失败: {e}")
 
+    def _get_site_resolver(self) -> TrackerSiteResolver:
+        """获取编译后的tracker映射解析器，映射表变化时重新编译"""
+        resolver = self._site_resolver
+        if resolver is None or resolver.mapping_text != (self._tracker_mapping or ""):
+            resolver = TrackerSiteResolver(self._tracker_mapping)
+            self._site_resolver = resolver
+        return resolver
+
     def _parse_tracker_mapping(self) -> Dict[str, str]:
         """解析tracker映射表"""
-        mapping = {}
-        if not self._tracker_mapping:
-            return mapping
-        
-        try:
-            for line in self._tracker_mapping.strip().split('\n'):
-                line = line.strip()
-                if ':' in line:
-                    tracker, site_name = line.split(':', 1)
-                    mapping[tracker.strip()] = site_name.strip()
-        except Exception as e:
-            logger.error(f"解析tracker映射表失败: {e}")
-        
-        return mapping
+        return self._get_site_resolver().mapping
 
     def _get_site_name_from_tracker(self, tracker_url: str) -> str:
         """根据 tracker 通过映射表或正则推断站点名称。
-        优先映射表；无匹配则取域名的二级名作为站点名；失败返回 '其他'。"""
-        if not tracker_url:
-            return '其他'
-
-        logger.info(f"开始解析tracker: {tracker_url}")
-
-        # 1) 映射表优先
-        mapping = self._parse_tracker_mapping() or {}
-        logger.info(f"映射表内容: {mapping}")
-        
-        for tracker, site_name in mapping.items():
-            try:
-                logger.info(f"尝试匹配: tracker='{tracker}' in tracker_url='{tracker_url}'")
-                if tracker and tracker in tracker_url:
-                    logger.info(f"映射表匹配成功: {tracker} -> {site_name}")
-                    return site_name
-                else:
-                    logger.info(f"映射表匹配失败: {tracker} not in {tracker_url}")
-            except Exception as e:
-                logger.warning(f"映射表匹配异常: {tracker} -> {e}")
-                continue
+        优先映射表；无匹配则取域名的二级名作为站点名；失败返回 '其他站点'，tracker为空返回 '其他'。"""
+        return self._get_site_resolver().resolve(tracker_url)
 
-        # 2) 正则推断域名的二级名（忽略常见前缀）
-        try:
-            import re
-            # 提取 host
-            host_match = re.search(r'(?:(?:https?|udp)://)?([^/:]+)', tracker_url)
-            host = host_match.group(1) if host_match else tracker_url
-            logger.info(f"提取的host: {host}")
-            
-            labels = host.split('.')
-            logger.info(f"host分割结果: {labels}")
-            
-            # 去掉常见前缀
-            prefixes = {"tracker", "www", "tra1", "t", "relay01"}
-            labels = [l for l in labels if l not in prefixes]
-            logger.info(f"去除前缀后: {labels}")
-            
-            if len(labels) >= 2:
-                site_key = labels[-2]
-                logger.info(f"正则解析成功: {site_key}")
-                return site_key
-        except Exception as e:
-            logger.warning(f"正则解析异常: {e}")
+    def _get_site_name_from_key(self, site_key: str) -> str:
+        """统计键（tracker host）按当前映射表转换为站点名称"""
+        return self._get_site_resolver().site_name(site_key)
 
-        # 3) 仍失败
-        logger.info(f"未能从映射或正则识别站点，tracker={tracker_url}")
-        return '其他站点'
+    def _group_by_site_name(self, values: Dict[str, int]) -> Dict[str, int]:
+        """将以tracker host为键的统计按站点名称合并"""
+        grouped = {}
+        for site_key, value in (values or {}).items():
+            site_name = self._get_site_name_from_key(site_key)
+            grouped[site_name] = grouped.get(site_name, 0) + value
+        return grouped
 
     def _get_tracker_mapping_page(self) -> List[dict]:
         """获取tracker映射页面"""
@@ -1316,7 +1909,7 @@ class QbReseedJump(_PluginBase):
                             {
                                 'component': 'div',
                                 'props': {'class': 'text-caption text-grey mb-2'},
-                                'text': '每行一个映射，格式：tracker域名:站点名称。保存后会自动重新处理历史数据。'
+                                'text': '每行一个映射，格式：tracker域名:站点名称。统计数据按tracker域名记录，保存后立即按新映射显示。'
                             },
                             {
                                 'component': 'VTextarea',
@@ -1366,10 +1959,8 @@ class QbReseedJump(_PluginBase):
                 self._tracker_mapping = mapping_text
             logger.info(f"Tracker映射表已更新: {len(self._tracker_mapping.split())} 条映射")
             
-            # 重新处理历史数据
-            logger.info("开始重新处理历史数据...")
-            self._reprocess_historical_data()
-            logger.info("历史数据重新处理完成")
+            # 统计数据以tracker host为键，站点名称在展示时按映射表转换，无需重写历史数据
+            self._get_site_resolver()
             return True
         except Exception as e:
             logger.error(f"保存tracker映射表失败: {e}")
@@ -1384,13 +1975,19 @@ class QbReseedJump(_PluginBase):
                 return Response(success=False, message="API认证失败")
             
             logger.info("手动触发重新处理历史数据...")
-            self._reprocess_historical_data()
-            logger.info("手动重新处理历史数据完成")
-            return Response(success=True, message="历史数据重新处理完成")
+            if not self._start_reprocess_job():
+                return Response(success=False, message="历史数据重新处理任务正在运行", data=self._remap_progress)
+            return Response(success=True, message="历史数据重新处理已开始", data=self._remap_progress)
         except Exception as e:
             logger.error(f"手动重新处理历史数据失败: {e}")
             return Response(success=False, message=f"重新处理失败: {str(e)}")
 
+    def reprocess_status(self, apikey: str) -> Response:
+        """查询重新处理历史数据的进度"""
+        if apikey != settings.API_TOKEN:
+            return Response(success=False, message="API认证失败")
+        return Response(success=True, data=self._remap_progress)
+
     def clear_all_history_data(self, apikey: str) -> Response:
         """清理所有历史数据"""
         try:
@@ -1402,8 +1999,14 @@ class QbReseedJump(_PluginBase):
             logger.info("开始清理所有历史数据...")
             
             # 清空所有统计数据
-            empty_stats = {"daily": {}, "total": {}}
-            self._save_stats(empty_stats)
+            with self._stats_lock:
+                self._stats_cache = self._empty_stats()
+                self._save_stats(self._stats_cache)
+                # 统计时序与跳校记录同样属于历史数据
+                if self._stats_store:
+                    self._stats_store.clear()
+            if self._event_store:
+                self._event_store.clear()
             
             logger.info("所有历史数据已清理完成")
             return Response(success=True, message="所有历史数据已清理完成")
@@ -1411,6 +2014,78 @@ class QbReseedJump(_PluginBase):
             logger.error(f"清理所有历史数据失败: {e}")
             return Response(success=False, message=f"清理失败: {str(e)}")
 
+    @staticmethod
+    def _date_to_ts(value: str) -> Optional[int]:
+        """YYYY-MM-DD 转为当天零点的时间戳"""
+        if not value:
+            return None
+        return int(datetime.strptime(value, "%Y-%m-%d").timestamp())
+
+    def query_events(self, apikey: str, date: str = None, downloader: str = None, outcome: str = None,
+                     infohash: str = None, limit: int = 500) -> Response:
+        """查询跳校事件"""
+        try:
+            if apikey != settings.API_TOKEN:
+                return Response(success=False, message="API认证失败")
+            if not self._event_store:
+                return Response(success=False, message="跳校事件日志未启用")
+            start = self._date_to_ts(date)
+            end = start + 86400 if start is not None else None
+            events = self._event_store.query(start=start, end=end, downloader=downloader, outcome=outcome,
+                                             infohash=infohash, limit=self._to_int(limit, 500, 1, 5000))
+            for event in events:
+                event["site_name"] = self._get_site_name_from_key(event["site"]) if event["site"] else None
+            return Response(success=True, data=events)
+        except Exception as e:
+            logger.error(f"查询跳校事件失败: {e}")
+            return Response(success=False, message=f"查询失败: {str(e)}")
+
+    def event_summary(self, apikey: str, start: str = None, end: str = None, downloader: str = None) -> Response:
+        """跳校事件汇总，end 为包含的最后一天"""
+        try:
+            if apikey != settings.API_TOKEN:
+                return Response(success=False, message="API认证失败")
+            if not self._event_store:
+                return Response(success=False, message="跳校事件日志未启用")
+            end_ts = self._date_to_ts(end)
+            summary = self._event_store.summary(start=self._date_to_ts(start),
+                                                end=end_ts + 86400 if end_ts is not None else None,
+                                                downloader=downloader)
+            for row in summary:
+                row["site_name"] = self._get_site_name_from_key(row["site"]) if row["site"] else None
+            return Response(success=True, data=summary)
+        except Exception as e:
+            logger.error(f"汇总跳校事件失败: {e}")
+            return Response(success=False, message=f"汇总失败: {str(e)}")
+
+    def pending_torrents(self, apikey: str, downloader: str = None) -> Response:
+        """多次重试仍未完成的种子"""
+        try:
+            if apikey != settings.API_TOKEN:
+                return Response(success=False, message="API认证失败")
+            if not self._state_store:
+                return Response(success=False, message="跳校进度记录未启用")
+            return Response(success=True, data=self._state_store.exhausted(downloader, self._resume_max_attempts))
+        except Exception as e:
+            logger.error(f"查询未完成的跳校失败: {e}")
+            return Response(success=False, message=f"查询失败: {str(e)}")
+
+    def query_stats_series(self, apikey: str, start: str = None, end: str = None, downloader: str = None,
+                           site: str = None) -> Response:
+        """查询统计时序数据，site 为tracker host，为空字符串时返回下载器的成功/失败合计"""
+        try:
+            if apikey != settings.API_TOKEN:
+                return Response(success=False, message="API认证失败")
+            if not self._stats_store:
+                return Response(success=False, message="统计时序数据未启用")
+            rows = self._stats_store.query(start=start, end=end, downloader=downloader, site=site)
+            for row in rows:
+                row["site_name"] = self._get_site_name_from_key(row["site"]) if row["site"] else None
+            return Response(success=True, data=rows)
+        except Exception as e:
+            logger.error(f"查询统计时序数据失败: {e}")
+            return Response(success=False, message=f"查询失败: {str(e)}")
+
     def test_api(self) -> Response:
         """测试API方法"""
         try:
@@ -1420,115 +2095,95 @@ class QbReseedJump(_PluginBase):
             logger.error(f"测试API失败: {e}")
             return Response(success=False, message=f"测试API失败: {str(e)}")
 
+    def _start_reprocess_job(self) -> bool:
+        """在后台线程中重新处理历史数据，已有任务运行时返回 False"""
+        with self._remap_lock:
+            if self._remap_thread and self._remap_thread.is_alive():
+                return False
+            self._remap_progress = {"state": "pending"}
+            self._remap_thread = Thread(target=self._reprocess_historical_data, name="qbreseedjump-remap",
+                                        daemon=True)
+            self._remap_thread.start()
+            return True
+
     def _reprocess_historical_data(self):
-        """重新处理历史数据，更新站点名称"""
+        """重新处理历史数据，更新旧版本以站点名称为键的数据：每个不同的站点键只解析一次，只重写发生变化的数据桶。
+        以tracker host为键的数据在展示时按映射表转换，不做改写"""
+        progress = {"state": "running", "started": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                    "keys": 0, "buckets": 0, "processed": 0, "changed": 0}
+        self._remap_progress = progress
         try:
             logger.info("开始重新处理历史数据...")
             stats = self._load_stats()
-            updated = False
-            
-            # 记录当前映射表
-            mapping = self._parse_tracker_mapping()
-            logger.info(f"当前映射表: {mapping}")
-            
-            # 处理每日数据
-            daily_count = 0
-            for date_key, daily_data in stats.get("daily", {}).items():
-                for downloader, data in daily_data.items():
-                    if "volumes" in data and "trackers" in data:
-                        logger.info(f"处理每日数据: {date_key} - {downloader}")
-                        logger.info(f"原始volumes: {data['volumes']}")
-                        logger.info(f"原始trackers: {data['trackers']}")
-                        
-                        # 重新映射tracker名称
-                        new_volumes = {}
-                        new_trackers = {}
-                        
-                        for tracker, volume in data["volumes"].items():
-                            # 直接使用tracker名称进行映射，不需要重新获取种子信息
-                            new_site_name = self._get_site_name_from_tracker(tracker)
-                            logger.info(f"映射 {tracker} -> {new_site_name}")
-                            new_volumes[new_site_name] = new_volumes.get(new_site_name, 0) + volume
-                        
-                        for tracker, count in data["trackers"].items():
-                            new_site_name = self._get_site_name_from_tracker(tracker)
-                            logger.info(f"映射 {tracker} -> {new_site_name}")
-                            new_trackers[new_site_name] = new_trackers.get(new_site_name, 0) + count
-                        
-                        logger.info(f"新volumes: {new_volumes}")
-                        logger.info(f"新trackers: {new_trackers}")
-                        
-                        # 过滤未知/其他
-                        if '未知站点' in new_volumes:
-                            del new_volumes['未知站点']
-                        if '其他' in new_volumes:
-                            del new_volumes['其他']
-                        if '未知站点' in new_trackers:
-                            del new_trackers['未知站点']
-                        if '其他' in new_trackers:
-                            del new_trackers['其他']
-
-                        # 更新数据
-                        data["volumes"] = new_volumes
-                        data["trackers"] = new_trackers
-                        updated = True
-                        daily_count += 1
-            
-            # 处理累计数据
-            total_count = 0
-            for downloader, data in stats.get("total", {}).items():
-                if "volumes" in data and "trackers" in data:
-                    logger.info(f"处理累计数据: {downloader}")
-                    logger.info(f"原始volumes: {data['volumes']}")
-                    logger.info(f"原始trackers: {data['trackers']}")
-                    
-                    # 重新映射tracker名称
-                    new_volumes = {}
-                    new_trackers = {}
-                    
-                    for tracker, volume in data["volumes"].items():
-                        new_site_name = self._get_site_name_from_tracker(tracker)
-                        logger.info(f"映射 {tracker} -> {new_site_name}")
-                        new_volumes[new_site_name] = new_volumes.get(new_site_name, 0) + volume
-                    
-                    for tracker, count in data["trackers"].items():
-                        new_site_name = self._get_site_name_from_tracker(tracker)
-                        logger.info(f"映射 {tracker} -> {new_site_name}")
-                        new_trackers[new_site_name] = new_trackers.get(new_site_name, 0) + count
-                    
-                    logger.info(f"新volumes: {new_volumes}")
-                    logger.info(f"新trackers: {new_trackers}")
-                    
-                    # 过滤未知/其他
-                    if '未知站点' in new_volumes:
-                        del new_volumes['未知站点']
-                    if '其他' in new_volumes:
-                        del new_volumes['其他']
-                    if '未知站点' in new_trackers:
-                        del new_trackers['未知站点']
-                    if '其他' in new_trackers:
-                        del new_trackers['其他']
-
-                    # 更新数据
-                    data["volumes"] = new_volumes
-                    data["trackers"] = new_trackers
-                    updated = True
-                    total_count += 1
-            
-            if updated:
-                self._save_stats(stats)
-                logger.info(f"历史数据已重新处理，站点名称已更新 - 处理了 {daily_count} 个每日数据，{total_count} 个累计数据")
+
+            # 每日与累计数据中各下载器的数据桶
+            buckets = [data for daily_data in stats.get("daily", {}).values() for data in daily_data.values()]
+            buckets.extend(stats.get("total", {}).values())
+            buckets = [data for data in buckets if "volumes" in data and "trackers" in data]
+            progress["buckets"] = len(buckets)
+
+            # 所有不同的站点键只解析一次；已是站点名称或无法解析的键保持不变，重复处理结果一致
+            resolver = self._get_site_resolver()
+            site_names = set(resolver.mapping.values())
+
+            def _remap(key: str) -> str:
+                if key in site_names or resolver.is_host_key(key):
+                    return key
+                site_name = resolver.resolve(key)
+                return key if site_name == '其他站点' else site_name
+
+            keys = {key for data in buckets for field in ("trackers", "volumes") for key in data[field]}
+            memo = {key: _remap(key) for key in keys}
+            progress["keys"] = len(keys)
+            # 解析后名称不变、且不会被过滤的键无需处理
+            dropped = {'未知站点', '其他'}
+            remapped = {key for key, site_name in memo.items() if site_name != key or site_name in dropped}
+            logger.info(f"历史数据共 {len(keys)} 个站点键，其中 {len(remapped)} 个需要重新映射")
+
+            changed = []
+            for data in buckets:
+                progress["processed"] += 1
+                if not remapped or all(remapped.isdisjoint(data[field]) for field in ("trackers", "volumes")):
+                    continue
+                changed.append(data)
+
+            if changed:
+                with self._stats_lock:
+                    for data in changed:
+                        for field in ("trackers", "volumes"):
+                            new_values = {}
+                            for key, value in data[field].items():
+                                # 扫描后新增的键在锁内补充解析
+                                site_name = memo[key] if key in memo else _remap(key)
+                                if site_name in dropped:
+                                    continue
+                                new_values[site_name] = new_values.get(site_name, 0) + value
+                            data[field] = new_values
+                    self._rebuild_rollups(stats)
+                    self._save_stats(stats)
+                progress["changed"] = len(changed)
+                logger.info(f"历史数据已重新处理，站点名称已更新 - 更新了 {len(changed)}/{len(buckets)} 个数据桶")
             else:
                 logger.info("没有需要更新的历史数据")
-                
+            progress["state"] = "done"
         except Exception as e:
+            progress["state"] = "failed"
+            progress["error"] = str(e)
             logger.error(f"重新处理历史数据失败: {e}")
-
-    def _update_stats(self, downloader_name: str, success_count: int, failed_count: int, 
-                     tracker_info: dict = None, volume_info: dict = None):
-        """更新统计数据"""
+        finally:
+            progress["finished"] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+    def _update_stats(self, downloader_name: str, success_count: int, failed_count: int,
+                      tracker_info: dict = None, volume_info: dict = None):
+        """更新统计数据：在 _stats_lock 内取当前缓存修改，运行期间清空历史数据后写入的是新的缓存"""
+        # 多个下载器并行处理时，读-改-写需要串行化
+        with self._stats_lock:
+            stats = self.__cached_stats()
+            self.__update_stats(stats, downloader_name, success_count, failed_count, tracker_info, volume_info)
+
+    def __update_stats(self, stats: Dict, downloader_name: str, success_count: int, failed_count: int,
+                       tracker_info: dict = None, volume_info: dict = None):
         try:
-            stats = self._load_stats()
             today = date.today().strftime("%Y-%m-%d")
             
             # 更新今日统计
@@ -1591,17 +2246,104 @@ class QbReseedJump(_PluginBase):
                         stats["total"][downloader_name]["volumes"][tracker] = 0
                     stats["total"][downloader_name]["volumes"][tracker] += volume
             
-            # 清理30天前的数据
+            # 写入统计时序表，只累加今天涉及的行
+            if self._stats_store:
+                self._stats_store.add(today, downloader_name, success_count, failed_count,
+                                      {k: v for k, v in (tracker_info or {}).items() if k and k != "未知站点"},
+                                      {k: v for k, v in (volume_info or {}).items() if k and k != "未知站点"})
+
+            # 更新汇总数据
+            valid_trackers = {k: v for k, v in (tracker_info or {}).items() if k and k != "未知站点"}
+            valid_volumes = {k: v for k, v in (volume_info or {}).items() if k and k != "未知站点"}
+            rollup = stats.setdefault("rollup", self._empty_rollup())
+            day = rollup["daily"].setdefault(today, {"count": 0, "volume": 0, "trackers": {}, "volumes": {}})
+            self._rollup_add(day, success_count + failed_count, valid_trackers, valid_volumes)
+            self._rollup_add(rollup["total"], success_count + failed_count, valid_trackers, valid_volumes)
+
+            # 清理30天前的数据（长期数据保存在统计时序表中）
             cutoff_date = (date.today() - timedelta(days=30)).strftime("%Y-%m-%d")
             stats["daily"] = {k: v for k, v in stats["daily"].items() if k >= cutoff_date}
+            rollup["daily"] = {k: v for k, v in rollup["daily"].items() if k >= cutoff_date}
             
             self._save_stats(stats)
             logger.info(f"统计数据已更新: {downloader_name} - 成功 {success_count}, 失败 {failed_count}")
         except Exception as e:
             logger.error(f"更新统计数据失败: {e}")
 
+    def _scheduled_reseed(self):
+        """自适应定时入口：空闲退避期间跳过本次定时，不访问下载器"""
+        if self._skip_ticks > 0:
+            self._skip_ticks -= 1
+            logger.debug(f"自适应定时：近期未发现候选种子，跳过本次执行，还将跳过 {self._skip_ticks} 次")
+            return
+        self.reseed_all()
+
+    def _adapt_schedule(self, candidates: int):
+        """根据本次运行的候选数量调整后续定时：连续空闲时跳过次数按 1、3、7… 递增，发现候选后立即恢复"""
+        if not self._adaptive:
+            return
+        if candidates:
+            if self._idle_runs:
+                logger.info("自适应定时：发现候选种子，恢复为每次执行")
+            self._idle_runs = 0
+            self._skip_ticks = 0
+            return
+        self._idle_runs += 1
+        self._skip_ticks = min(2 ** min(self._idle_runs, 16) - 1, self._adaptive_max_skip)
+        logger.info(f"自适应定时：连续 {self._idle_runs} 次未发现候选种子，接下来跳过 {self._skip_ticks} 次定时执行")
+
+    def _reset_schedule(self):
+        if self._skip_ticks or self._idle_runs:
+            logger.info("自适应定时：收到新任务事件，恢复为每次执行")
+        self._idle_runs = 0
+        self._skip_ticks = 0
+
+    @eventmanager.register(EventType.DownloadAdded)
+    def handle_download_added(self, event: PluginEvent):
+        """有新的下载任务时恢复正常定时，任务完成后可被及时处理"""
+        if not self._enabled or not self._adaptive or not self._event_trigger:
+            return
+        event_data = (event.event_data if event else None) or {}
+        downloader = event_data.get("downloader")
+        if downloader and self._downloaders and downloader not in self._downloaders:
+            return
+        self._reset_schedule()
+
+    @eventmanager.register(EventType.PluginAction)
+    def handle_plugin_action(self, event: PluginEvent):
+        """通过命令或其他插件的 PluginAction 事件（action=qbreseedjump）立即执行一次"""
+        event_data = (event.event_data if event else None) or {}
+        if event_data.get("action") != "qbreseedjump" or not self._enabled:
+            return
+        self._reset_schedule()
+        Thread(target=self.reseed_all, name="qbreseedjump-action", daemon=True).start()
+
     def reseed_all(self):
-        """执行跳校任务"""
+        """执行跳校任务，同一时间只运行一次，重叠的触发按配置跳过或在结束后再执行一次"""
+        with self._run_state_lock:
+            if self._running:
+                if self._overlap_policy == "queue":
+                    self._run_pending = True
+                    logger.info("上一次跳校任务仍在运行，本次任务将在其结束后执行")
+                else:
+                    logger.info("上一次跳校任务仍在运行，跳过本次执行")
+                return
+            self._running = True
+        try:
+            while True:
+                self.__reseed_all()
+                with self._run_state_lock:
+                    if not self._run_pending or self._event.is_set():
+                        self._run_pending = False
+                        return
+                    self._run_pending = False
+                logger.info("开始执行排队的跳校任务")
+        finally:
+            with self._run_state_lock:
+                self._running = False
+
+    def __reseed_all(self):
+        """执行一次跳校任务"""
         # 验证风险确认
         required_text = "我已知晓跳校可能带来的所有不良后果，且不会因此迁怒开发者"
         if not self._risk_confirmation or self._risk_confirmation.strip() != required_text:
@@ -1623,43 +2365,51 @@ class QbReseedJump(_PluginBase):
         total_success = 0
         total_failed = 0
 
+        active_services = {}
         for service_name, service_info in services.items():
             if service_info.instance.is_inactive():
                 logger.warning(f"下载器 {service_name} 未连接，跳过")
                 continue
+            active_services[service_name] = service_info
+
+        # 清理过期的跳校事件
+        if self._event_store:
+            try:
+                purged = self._event_store.purge()
+                if purged:
+                    logger.info(f"已清理 {purged} 条过期跳校事件")
+            except Exception as e:
+                logger.error(f"清理过期跳校事件失败: {e}")
+
+        # 统计时序数据降采样
+        if self._stats_store:
+            try:
+                merged = self._stats_store.downsample()
+                if merged:
+                    logger.info(f"统计时序数据已降采样 {merged} 行")
+            except Exception as e:
+                logger.error(f"统计时序数据降采样失败: {e}")
 
-            candidates, success, failed = self._reseed_service(service_info)
+        for candidates, success, failed in self._reseed_services(active_services):
             total_candidates += candidates
             total_success += success
             total_failed += failed
 
         logger.info(f"跳校任务完成：总任务 {total_candidates}，成功 {total_success}，失败 {total_failed}")
+        self._adapt_schedule(total_candidates)
 
         if self._notify and (total_success > 0 or total_failed > 0):
             try:
                 logger.info(f"准备发送通知: _notify={self._notify}, total_success={total_success}, total_failed={total_failed}")
                 
-                # 从统计数据中获取今日和总的跳校信息
-                stats = self._load_stats()
+                # 从当前的统计汇总中获取今日和总的跳校信息
                 today = date.today().strftime("%Y-%m-%d")
-                
-                # 计算今日跳校数量和体积
-                today_count = 0
-                today_volume = 0
-                if today in stats.get("daily", {}):
-                    for downloader, data in stats["daily"][today].items():
-                        today_count += data.get("success", 0) + data.get("failed", 0)
-                        if "volumes" in data:
-                            today_volume += sum(data["volumes"].values())
-                
-                # 计算总跳校数量和体积
-                total_count = 0
-                total_volume = 0
-                if stats.get("total"):
-                    for downloader, data in stats["total"].items():
-                        total_count += data.get("success", 0) + data.get("failed", 0)
-                        if "volumes" in data:
-                            total_volume += sum(data["volumes"].values())
+                rollup = self._load_stats().get("rollup") or self._empty_rollup()
+                today_rollup = rollup["daily"].get(today) or {}
+                today_count = today_rollup.get("count", 0)
+                today_volume = today_rollup.get("volume", 0)
+                total_count = rollup["total"].get("count", 0)
+                total_volume = rollup["total"].get("volume", 0)
                 
                 # 格式化体积显示
                 def format_volume(bytes_val):
@@ -1693,60 +2443,105 @@ class QbReseedJump(_PluginBase):
         else:
             logger.info(f"跳过通知发送: _notify={self._notify}, total_success={total_success}, total_failed={total_failed}")
 
-    def _reseed_service(self, service_info: ServiceInfo):
-        """处理单个下载器的跳校任务"""
-        service = service_info.instance
+    def _reseed_services(self, services: Dict[str, ServiceInfo]) -> List[Tuple[int, int, int]]:
+        """各下载器在独立线程中同时处理，单个下载器失败或超时不影响其他下载器"""
+        if not services:
+            return []
+
+        timeout = self._downloader_timeout * 60 if self._downloader_timeout else None
+        deadline = time.monotonic() + timeout if timeout else None
+        results = []
+        executor = ThreadPoolExecutor(max_workers=len(services), thread_name_prefix="qbreseedjump")
+        try:
+            futures = {executor.submit(self._reseed_service, service_info, deadline): service_name
+                       for service_name, service_info in services.items()}
+            done, not_done = wait(futures, timeout=timeout)
+            for future in done:
+                try:
+                    result = future.result()
+                    if result is not None:
+                        results.append(result)
+                except Exception as e:
+                    logger.error(f"[{futures[future]}] 处理失败: {e}")
+            for future in not_done:
+                logger.warning(f"[{futures[future]}] 处理超时（{self._downloader_timeout} 分钟），"
+                               f"正在处理的种子完成后停止，结果不计入本次汇总")
+        finally:
+            # 超时的下载器不再等待，其线程在当前种子处理完后自行退出
+            executor.shutdown(wait=False, cancel_futures=True)
+        return results
+
+    def _reseed_service(self, service_info: ServiceInfo, deadline: float = None) -> Optional[Tuple[int, int, int]]:
+        """处理单个下载器的跳校任务，该下载器上次超时的任务仍在运行时跳过并返回 None"""
+        with self._busy_lock:
+            if service_info.name in self._busy_downloaders:
+                logger.warning(f"[{service_info.name}] 上次的跳校任务仍在运行，本次跳过该下载器")
+                return None
+            self._busy_downloaders.add(service_info.name)
+        try:
+            return self.__reseed_service(service_info, deadline)
+        finally:
+            with self._busy_lock:
+                self._busy_downloaders.discard(service_info.name)
+
+    def __reseed_service(self, service_info: ServiceInfo, deadline: float = None) -> Tuple[int, int, int]:
         candidates = []
         success = 0
         failed = 0
+        started = time.monotonic()
+        self._unreachable_paths[service_info.name] = set()
+        self._payload_retries[service_info.name] = {}
 
         try:
-            # 获取种子列表
-            torrents, error = service.get_torrents()
-            if error or not torrents:
-                logger.warning(f"[{service_info.name}] 获取种子列表失败")
-                return 0, 0, 0
-
-            logger.info(f"[{service_info.name}] 获取到 {len(torrents)} 个种子")
-
-            # 筛选候选种子
-            for torrent in torrents:
-                if self._is_candidate(torrent, service_info):
-                    candidates.append(torrent)
+            # 先继续处理上次未完成的种子
+            resumed = self._resume_pending(service_info)
+
+            # 获取候选种子
+            found = self._discover_candidates(service_info)
+            if found is None:
+                found = []
+
+            # 按hash去重，保证同一任务只会被删除一次
+            seen_hashes = set()
+            for torrent in found:
+                if torrent.hash in seen_hashes:
+                    continue
+                seen_hashes.add(torrent.hash)
+                candidates.append(torrent)
+            candidates = self._exclude_payload_skipped(service_info, candidates)
 
             logger.info(f"[{service_info.name}] 找到 {len(candidates)} 个候选种子")
+            self._prefetch_trackers(service_info, candidates)
 
             # 处理每个候选种子
             all_tracker_info = {}
             all_volume_info = {}
-            
-            for torrent in candidates:
-                try:
-                    success_flag, tracker_info, volume_info = self._reseed_torrent(torrent, service_info)
-                    if success_flag:
-                        success += 1
-                    else:
-                        failed += 1
-                    
-                    # 合并tracker信息（数量）
-                    for tracker, count in tracker_info.items():
-                        if tracker not in all_tracker_info:
-                            all_tracker_info[tracker] = 0
-                        all_tracker_info[tracker] += count
-                    
-                    # 合并体积信息
-                    logger.info(f"[{service_info.name}] 合并体积信息: {volume_info}")
-                    for tracker, volume in volume_info.items():
-                        if tracker not in all_volume_info:
-                            all_volume_info[tracker] = 0
-                        all_volume_info[tracker] += volume
-                    logger.info(f"[{service_info.name}] 合并后体积信息: {all_volume_info}")
-                        
-                except Exception as e:
-                    logger.error(f"[{service_info.name}] 处理种子失败: {e}")
+
+            for success_flag, tracker_info, volume_info in chain(
+                    resumed, self._run_reseed_pipeline(candidates, service_info, deadline)):
+                if success_flag:
+                    success += 1
+                else:
                     failed += 1
 
-            logger.info(f"[{service_info.name}] 完成：成功 {success}，失败 {failed}，总计 {len(candidates)}")
+                # 合并tracker信息（数量）
+                for tracker, count in tracker_info.items():
+                    if tracker not in all_tracker_info:
+                        all_tracker_info[tracker] = 0
+                    all_tracker_info[tracker] += count
+
+                # 合并体积信息
+                for tracker, volume in volume_info.items():
+                    if tracker not in all_volume_info:
+                        all_volume_info[tracker] = 0
+                    all_volume_info[tracker] += volume
+
+            sites = sorted(self._group_by_site_name(all_tracker_info).items(), key=lambda item: item[1], reverse=True)
+            logger.info(f"[{service_info.name}] 完成：成功 {success}，失败 {failed}，总计 {len(candidates)}，"
+                        + (f"续跑 {len(resumed)}，" if resumed else "")
+                        + f"体积 {sum(all_volume_info.values()) / 1024 ** 3:.2f}GB，"
+                        f"耗时 {time.monotonic() - started:.1f}s"
+                        + (f"，站点 {', '.join(f'{site}×{count}' for site, count in sites[:5])}" if sites else ""))
 
             # 更新统计数据
             if success > 0 or failed > 0:
@@ -1757,197 +2552,835 @@ class QbReseedJump(_PluginBase):
         except Exception as e:
             logger.error(f"[{service_info.name}] 处理失败: {e}")
             return len(candidates), success, failed
+        finally:
+            self._prefetched_trackers.pop(service_info.name, None)
 
-    def _is_candidate(self, torrent, service_info: ServiceInfo) -> bool:
-        """判断是否为候选种子"""
+    def _discover_candidates(self, service_info: ServiceInfo) -> Optional[list]:
+        """获取候选种子，开启增量同步时只判断发生变化的种子，失败时回退为全量获取"""
+        if self._incremental_sync:
+            try:
+                mirror = self._sync_mirrors.setdefault(service_info.name, QbSyncMirror(service_info.name))
+                result = mirror.refresh(self._get_qb_session(service_info),
+                                        lambda torrent: self._is_candidate(torrent, service_info, check_age=False))
+                if result is not None:
+                    candidates, changed = result
+                    # 添加时间条件随时间变化，不随字段变化重新判断，每次取出候选时检查
+                    if self._candidate_filter is None:
+                        self._candidate_filter = self._build_candidate_filter()
+                    candidates = [torrent for torrent in candidates if self._candidate_filter.matches_age(torrent)]
+                    logger.info(f"[{service_info.name}] 增量同步：镜像 {len(mirror.torrents)} 个种子，"
+                                f"本次变化 {changed} 个")
+                    return candidates
+            except Exception as e:
+                logger.warning(f"[{service_info.name}] 增量同步异常，回退为全量获取: {e}")
+            # 同步失败时丢弃镜像，下次重新全量同步
+            self._sync_mirrors.pop(service_info.name, None)
+
+        # 由下载器按状态、标签、分类预筛选，仅候选种子经网络传输
         try:
-            torrent_name = getattr(torrent, 'name', 'Unknown')
-            
-            # 检查暂停状态
-            if self._pausedonly:
-                # 只处理真正暂停的状态，不包括未活跃但未暂停的状态
-                paused_states = ["pausedUP", "pausedDL"]
-                if torrent.state not in paused_states:
-                    return False
+            torrents = self._fetch_prefiltered_torrents(service_info)
+            if torrents is not None:
+                logger.info(f"[{service_info.name}] 下载器预筛选返回 {len(torrents)} 个种子")
+                return [torrent for torrent in torrents if self._is_candidate(torrent, service_info)]
+        except Exception as e:
+            logger.warning(f"[{service_info.name}] 下载器预筛选异常，回退为本地筛选: {e}")
 
-            # 检查标签
-            if self._includetags and hasattr(torrent, 'tags') and torrent.tags:
-                tags = [tag.strip() for tag in torrent.tags.split(',')]
-                include_tags = [tag.strip() for tag in self._includetags.split(',')]
-                if not any(tag in tags for tag in include_tags):
-                    return False
+        # 获取种子列表
+        torrents, error = service_info.instance.get_torrents()
+        if error or not torrents:
+            logger.warning(f"[{service_info.name}] 获取种子列表失败")
+            return None
 
-            # 检查分类
-            if self._includecategory and torrent.category:
-                include_categories = [cat.strip() for cat in self._includecategory.split(',')]
-                if torrent.category not in include_categories:
-                    return False
+        logger.info(f"[{service_info.name}] 获取到 {len(torrents)} 个种子")
+        return [torrent for torrent in torrents if self._is_candidate(torrent, service_info)]
+
+    def _fetch_prefiltered_torrents(self, service_info: ServiceInfo) -> Optional[list]:
+        """
+        按筛选条件分多次查询 torrents/info 并按hash合并，结果仍需本地筛选。
+        未打标签/未分类的种子在本地筛选中视为通过，因此额外查询一次空标签/空分类。
+        """
+        session = self._get_qb_session(service_info)
+        base_params = {}
+        if self._pausedonly:
+            base_params["filter"] = session.paused_filter()
+
+        include_tags = sorted(CandidateFilter.split(self._includetags))
+        include_categories = sorted(CandidateFilter.split(self._includecategory))
+        if include_tags:
+            queries = [{**base_params, "tag": tag} for tag in include_tags + [""]]
+        elif include_categories:
+            queries = [{**base_params, "category": cat} for cat in include_categories + [""]]
+        else:
+            queries = [base_params]
+
+        torrents = {}
+        for params in queries:
+            result = session.torrents_info(**params)
+            if result is None:
+                return None
+            for torrent in result:
+                torrents.setdefault(torrent.hash, torrent)
+        return list(torrents.values())
+
+    def _run_reseed_pipeline(self, candidates: list, service_info: ServiceInfo, deadline: float = None):
+        """按配置的并发数处理候选种子，逐个产出 (是否成功, tracker信息, 体积信息)。
+        结果只在调用线程中汇总，统计不会因并发而丢失。
+        重新添加成功的种子先进入待确认列表，每积累一批用一次查询统一确认。"""
+        if self._batch_size > 1:
+            jobs = self._group_batches(candidates)
+        else:
+            jobs = [[torrent] for torrent in candidates]
+
+        pending = _PendingVerification()
+
+        def _safe_reseed(torrents: list) -> List[tuple]:
+            torrents = self._claim_inflight(service_info, torrents)
+            if not torrents:
+                return []
+            try:
+                if len(torrents) == 1:
+                    result = self._reseed_torrent(torrents[0], service_info, pending)
+                    return [result] if result else []
+                return self._reseed_batch(torrents, service_info, pending)
+            except Exception as e:
+                logger.error(f"[{service_info.name}] 处理种子失败: {e}")
+                return [(False, {}, {})] * len(torrents)
+            finally:
+                self._release_inflight(service_info, torrents)
+
+        def _verify(force: bool = False):
+            results = []
+            while force or len(pending) >= self._verify_batch_size:
+                items = pending.drain()
+                if not items:
+                    break
+                results.extend(self._verify_readded(service_info, items, pending))
+                # 未找到而再次添加的任务随下一批确认，收尾时稍后再确认一次
+                if not force or not len(pending):
+                    break
+                if self._event.wait(1):
+                    logger.info(f"[{service_info.name}] 收到停止信号，{len(pending)} 个重新添加的任务未确认，"
+                                f"下次运行继续处理")
+                    break
+            return results
+
+        if self._concurrency <= 1 or len(jobs) <= 1:
+            for torrents in jobs:
+                if self._is_stopped(deadline):
+                    logger.info(f"[{service_info.name}] 收到停止信号或已超时，剩余任务不再处理")
+                    break
+                yield from _safe_reseed(torrents)
+                yield from _verify()
+            yield from _verify(force=True)
+            return
+
+        workers = min(self._concurrency, len(jobs))
+        logger.info(f"[{service_info.name}] 并发处理 {len(candidates)} 个种子，并发数 {workers}")
+        with ThreadPoolExecutor(max_workers=workers,
+                                thread_name_prefix=f"qbreseedjump-{service_info.name}") as executor:
+            futures = [executor.submit(self._run_if_not_stopped, deadline, _safe_reseed, torrents)
+                       for torrents in jobs]
+            for future in as_completed(futures):
+                results = future.result()
+                if results is not None:
+                    yield from results
+                yield from _verify()
+        yield from _verify(force=True)
+
+    def _verify_readded(self, service_info: ServiceInfo, items: List[tuple],
+                        pending: _PendingVerification) -> List[tuple]:
+        """
+        一次查询确认一批重新添加的种子：任务存在、状态正常、保存路径、分类与已跳校标签均与添加参数一致。
+        items 为 (种子, 种子文件, 添加参数, tracker信息, 体积信息, 开始时间, 再次添加次数)；
+        不一致的计为失败，未出现的重新添加后放回 pending 随下一批确认，不在返回结果中
+        """
+        hashes = [item[0].hash for item in items]
+        found = None
+        try:
+            found = self._get_qb_session(service_info).torrents_info(hashes="|".join(hashes))
+        except Exception as e:
+            logger.warning(f"[{service_info.name}] 确认重新添加的任务失败: {e}")
+        if found is None:
+            # WebAPI 不可用时退回为只确认任务存在
+            torrents, error = service_info.instance.get_torrents(ids=hashes)
+            found = [] if error else [QbTorrent(hash=t.hash) for t in torrents or []]
+        found = {torrent.get("hash"): torrent for torrent in found}
+
+        results, verified = [], []
+        limiter = self._get_rate_limiter(service_info)
+        for torrent, content, add_params, tracker_info, volume_info, started, attempts in items:
+            current = found.get(torrent.hash)
+            if current is None and attempts < max(self._stage_retries, 1):
+                logger.warning(f"[{service_info.name}] 重新添加后未找到任务，再次添加: {torrent.name}")
+                success, stage = self._advance_reseed(service_info, torrent.hash, torrent.name, content, add_params,
+                                                      ReseedStateStore.DELETED, limiter, verify=False)
+                if success:
+                    pending.add(torrent, content, add_params, tracker_info, volume_info, started, attempts + 1)
+                    continue
+            elif current is None:
+                logger.error(f"[{service_info.name}] 重新添加后未找到任务: {torrent.name}")
+                self._update_state("fail", service_info.name, torrent.hash, "重新添加后未找到任务")
+                success, stage = False, "verify"
+            else:
+                mismatches = self._verify_mismatches(current, add_params, service_info)
+                if mismatches:
+                    logger.error(f"[{service_info.name}] 重新添加的任务与预期不一致: {torrent.name}，"
+                                 f"{'；'.join(mismatches)}")
+                verified.append(torrent.hash)
+                success, stage = not mismatches, "done" if not mismatches else "verify"
+                if success and self._is_traced(torrent.hash):
+                    logger.info(f"[{service_info.name}] [trace] {torrent.hash} 跳校成功: {torrent.name}")
+            results.append((success, tracker_info, volume_info))
+            self._record_events(service_info, [(torrent, success, stage, tracker_info, volume_info)], started)
+        # 已存在的任务无需保留种子文件，不一致的只计为失败
+        self._update_state("remove", service_info.name, verified)
+        return results
+
+    def _verify_mismatches(self, torrent: dict, add_params: dict, service_info: ServiceInfo) -> List[str]:
+        """对比重新添加的任务与实际提交给下载器的参数，返回不一致项"""
+        mismatches = []
+        state = torrent.get("state")
+        if state in self.VERIFY_ERROR_STATES:
+            mismatches.append(f"状态 {state}")
+        # MoviePilot 的qBittorrent模块仅在下载器开启分类自动管理时提交分类，同时启用自动种子管理（autoTMM），
+        # 此时保存路径由分类决定；未开启时分类不会提交
+        auto_category = bool(add_params.get("category")) and bool(getattr(service_info.instance, '_category', False))
+        if "save_path" in torrent and not auto_category:
+            expected_path = (add_params.get("download_dir") or "").rstrip("/\\")
+            actual_path = (torrent.get("save_path") or "").rstrip("/\\")
+            if expected_path and actual_path != expected_path:
+                mismatches.append(f"保存路径 {actual_path}，预期 {expected_path}")
+        if "category" in torrent:
+            expected_category = (add_params.get("category") or "") if auto_category else ""
+            if (torrent.get("category") or "") != expected_category:
+                mismatches.append(f"分类 {torrent.get('category') or '无'}，预期 {expected_category or '无'}")
+        if "tags" in torrent:
+            tags = {tag.strip() for tag in (torrent.get("tags") or "").split(",")}
+            missing_tags = [tag for tag in add_params.get("tag") or [] if tag and tag not in tags]
+            if missing_tags:
+                mismatches.append(f"缺少标签 {','.join(missing_tags)}")
+        return mismatches
+
+    def _group_batches(self, candidates: list) -> List[list]:
+        """按重新添加参数（保存路径、分类）分组，每组再按批量大小切分"""
+        groups: Dict[tuple, list] = {}
+        for torrent in candidates:
+            add_params = self._build_add_params(torrent)
+            key = (add_params.get("download_dir"), add_params.get("category"))
+            groups.setdefault(key, []).append(torrent)
+        batches = []
+        for torrents in groups.values():
+            for i in range(0, len(torrents), self._batch_size):
+                batches.append(torrents[i:i + self._batch_size])
+        return batches
+
+    def _get_rate_limiter(self, service_info: ServiceInfo) -> TokenBucketLimiter:
+        """获取下载器的限速器，跨运行保留降速状态，限速配置变化时重新创建"""
+        bytes_per_sec = self._rate_gb * 1024 ** 3
+        with self._rate_limiters_lock:
+            limiter = self._rate_limiters.get(service_info.name)
+            if not limiter or not limiter.matches(self._rate_ops, bytes_per_sec):
+                limiter = TokenBucketLimiter(name=service_info.name, ops_per_sec=self._rate_ops,
+                                             bytes_per_sec=bytes_per_sec)
+                self._rate_limiters[service_info.name] = limiter
+            return limiter
+
+    def _claim_inflight(self, service_info: ServiceInfo, torrents: list) -> list:
+        """登记正在处理的种子，返回本次成功登记的种子；已在处理中的种子跳过"""
+        base_url = self._get_qb_base_url(service_info)
+        claimed = []
+        with self._inflight_lock:
+            for torrent in torrents:
+                key = (base_url, torrent.hash)
+                if key in self._inflight:
+                    logger.warning(f"[{service_info.name}] 种子正在处理中，跳过: {torrent.name}")
+                    continue
+                self._inflight.add(key)
+                claimed.append(torrent)
+        return claimed
+
+    def _release_inflight(self, service_info: ServiceInfo, torrents: list):
+        base_url = self._get_qb_base_url(service_info)
+        with self._inflight_lock:
+            for torrent in torrents:
+                self._inflight.discard((base_url, torrent.hash))
+
+    def _run_if_not_stopped(self, deadline: Optional[float], func, *args):
+        """插件停止或超时后，尚未开始的任务直接跳过"""
+        if self._is_stopped(deadline):
+            return None
+        return func(*args)
+
+    def _is_stopped(self, deadline: float = None) -> bool:
+        """是否已收到停止信号或超过处理时限"""
+        if self._event.is_set():
             return True
+        return deadline is not None and time.monotonic() >= deadline
+
+    def _build_candidate_filter(self) -> CandidateFilter:
+        """根据当前配置编译候选筛选条件"""
+        return CandidateFilter(pausedonly=self._pausedonly,
+                               include_tags=self._includetags,
+                               exclude_tags=self._excludetags,
+                               include_categories=self._includecategory,
+                               include_sites=self._includesites,
+                               save_paths=self._savepaths,
+                               size_range=self._sizerange,
+                               added_days=self._addeddays,
+                               site_resolver=self._get_torrent_site_name)
+
+    def _get_torrent_site_name(self, torrent) -> str:
+        """根据种子列表中的tracker字段解析站点名称"""
+        tracker_url = self._get_torrent_tracker(torrent)
+        return self._get_site_name_from_tracker(tracker_url) if tracker_url else '其他站点'
+
+    def _get_torrent_tracker(self, torrent, service_name: str = None) -> Optional[str]:
+        """
+        种子的tracker地址：优先使用种子列表中的tracker字段，其次为批量预取的结果，最后取磁力链接的tr参数。
+        不访问种子对象的 trackers 属性，qbittorrent-api 每次访问都会单独请求一次接口
+        """
+        tracker_url = getattr(torrent, 'tracker', None)
+        if not tracker_url:
+            tracker_url = self._prefetched_trackers.get(service_name, {}).get(getattr(torrent, 'hash', None))
+        if not tracker_url:
+            tracker_url = self._get_magnet_tracker(torrent)
+        return tracker_url or None
+
+    @staticmethod
+    def _get_magnet_tracker(torrent) -> Optional[str]:
+        """暂停的种子没有当前tracker，从磁力链接的tr参数中获取"""
+        magnet_uri = getattr(torrent, 'magnet_uri', None) or ""
+        match = re.search(r'[?&]tr=([^&]+)', magnet_uri)
+        return unquote(match.group(1)) if match else None
+
+    def _prefetch_trackers(self, service_info: ServiceInfo, candidates: list):
+        """种子列表中没有tracker信息的候选种子，统一批量获取一次tracker地址，按下载器分别保存"""
+        missing = [torrent.hash for torrent in candidates
+                   if not getattr(torrent, 'tracker', None) and not self._get_magnet_tracker(torrent)]
+        if not missing:
+            return
+        try:
+            urls = self._get_qb_session(service_info).tracker_urls(missing)
+        except Exception as e:
+            logger.warning(f"[{service_info.name}] 批量获取tracker失败: {e}")
+            return
+        logger.debug(f"[{service_info.name}] 批量获取tracker：{len(missing)} 个种子缺少tracker信息，获取到 {len(urls)} 个")
+        self._prefetched_trackers[service_info.name] = urls
 
+    def _is_candidate(self, torrent, service_info: ServiceInfo, check_age: bool = True) -> bool:
+        """判断是否为候选种子"""
+        try:
+            if self._candidate_filter is None:
+                self._candidate_filter = self._build_candidate_filter()
+            return self._candidate_filter.matches(torrent, check_age=check_age)
         except Exception as e:
             logger.error(f"检查候选种子失败: {e}")
             return False
 
-    def _reseed_torrent(self, torrent, service_info: ServiceInfo) -> tuple[bool, dict, dict]:
-        """处理单个种子的跳校"""
+    def _reseed_torrent(self, torrent, service_info: ServiceInfo,
+                        pending: _PendingVerification) -> Optional[tuple[bool, dict, dict]]:
+        """处理单个种子的跳校；重新添加成功后放入待确认列表并返回 None，由调用方统一确认。
+        以前已计入过失败、磁盘文件仍异常的种子同样返回 None"""
+        started = time.monotonic()
+        stage = "prepare"
+        success = False
+        deferred = False
+        tracker_info, volume_info = {}, {}
         try:
             torrent_hash = torrent.hash
             torrent_name = torrent.name
-            save_path = torrent.save_path
-            category = torrent.category
-            tags = torrent.tags.split(',') if torrent.tags else []
 
-            logger.info(f"[{service_info.name}] 开始处理种子: {torrent_name}")
-            
-            # 收集tracker信息
-            tracker_info = {}
-            volume_info = {}
-            
-            # 收集体积信息（无论是否有tracker都要收集）
-            torrent_size = 0
-            # 尝试多种可能的size属性名
-            for size_attr in ['size', 'total_size', 'size_bytes']:
-                if hasattr(torrent, size_attr):
-                    torrent_size = getattr(torrent, size_attr)
-                    if torrent_size:
-                        break
-            
-            logger.info(f"[{service_info.name}] 种子属性: {[attr for attr in dir(torrent) if not attr.startswith('_')]}")
-            logger.info(f"[{service_info.name}] 种子大小: {torrent_size} bytes")
-            
-            if torrent_size:
-                # 尝试获取tracker信息
-                tracker_url = None
-                logger.info(f"[{service_info.name}] 检查tracker属性:")
-                
-                if hasattr(torrent, 'tracker'):
-                    logger.info(f"[{service_info.name}] torrent.tracker存在: {getattr(torrent, 'tracker', None)}")
-                    if torrent.tracker:
-                        tracker_url = torrent.tracker
-                
-                if hasattr(torrent, 'trackers'):
-                    logger.info(f"[{service_info.name}] torrent.trackers存在: {getattr(torrent, 'trackers', None)}")
-                    logger.info(f"[{service_info.name}] torrent.trackers类型: {type(getattr(torrent, 'trackers', None))}")
-                    if torrent.trackers:
-                        # 处理TrackersList对象
-                        if hasattr(torrent.trackers, '__iter__'):
-                            # 遍历tracker对象，找到有效的tracker URL
-                            for tracker_obj in torrent.trackers:
-                                if hasattr(tracker_obj, 'url') and tracker_obj.url:
-                                    # 跳过DHT、PeX、LSD等特殊tracker
-                                    if not any(skip in tracker_obj.url for skip in ['[DHT]', '[PeX]', '[LSD]']):
-                                        tracker_url = tracker_obj.url
-                                        logger.info(f"[{service_info.name}] 找到有效tracker: {tracker_url}")
-                                        break
-                        # 如果有多个tracker，使用第一个
-                        elif isinstance(torrent.trackers, list) and len(torrent.trackers) > 0:
-                            tracker_url = torrent.trackers[0]
-                            logger.info(f"[{service_info.name}] 使用第一个tracker: {tracker_url}")
-                        elif isinstance(torrent.trackers, str):
-                            tracker_url = torrent.trackers
-                            logger.info(f"[{service_info.name}] 使用字符串tracker: {tracker_url}")
-                        else:
-                            logger.info(f"[{service_info.name}] trackers格式不支持: {torrent.trackers}")
-                
-                logger.info(f"[{service_info.name}] 最终tracker_url: {tracker_url}")
-                
-                if tracker_url:
-                    # 使用新的站点名称获取逻辑
-                    site_name = self._get_site_name_from_tracker(tracker_url)
-                    logger.info(f"[{service_info.name}] 解析tracker: {tracker_url} -> {site_name}")
-                    tracker_info[site_name] = 1
-                    volume_info[site_name] = torrent_size
-                else:
-                    # 没有tracker信息，使用默认站点名称
-                    site_name = '其他站点'
-                    logger.info(f"[{service_info.name}] 未找到tracker信息，使用默认站点名")
-                    tracker_info[site_name] = 1
-                    volume_info[site_name] = torrent_size
-
-            # 导出种子文件
-            torrent_file = self._export_qb_torrent_via_api(torrent_hash, service_info)
-            if not torrent_file:
+            traced = self._is_traced(torrent_hash)
+            if traced:
+                logger.info(f"[{service_info.name}] [trace] {torrent_hash} 开始处理: {torrent_name}")
+
+            tracker_info, volume_info = self._collect_torrent_stats(torrent, service_info)
+
+            # 限速：按种子数与体积放行
+            limiter = self._get_rate_limiter(service_info)
+            if not limiter.acquire(ops=1, size=getattr(torrent, 'size', 0) or 0, stopped=self._event.is_set):
+                logger.info(f"[{service_info.name}] 收到停止信号，未处理: {torrent_name}")
+                return False, tracker_info, volume_info
+
+            # 导出种子文件（内存中传递，不落盘）
+            stage = "export"
+            content, meta = self._export_torrent(torrent, service_info)
+            if not content:
                 logger.error(f"[{service_info.name}] 导出种子文件失败: {torrent_name}")
                 return False, tracker_info, volume_info
 
-            # 删除原任务
-            if not service_info.instance.delete_torrents(ids=torrent_hash, delete_file=False):
-                logger.error(f"[{service_info.name}] 删除原任务失败: {torrent_name}")
+            # 校验导出内容，不完整或不匹配时不删除原任务
+            stage = "validate"
+            meta = self._validate_export(torrent, content, service_info, meta)
+            if not meta:
                 return False, tracker_info, volume_info
 
-            # 重新添加任务
-            try:
-                # 读取种子文件内容
-                with open(torrent_file, 'rb') as f:
-                    content = f.read()
-                
-                # 构建添加参数
-                add_params = {
-                    "download_dir": save_path,
-                    "is_paused": not self._autostart,
-                    "tag": [self._processedtag],
-                    "is_skip_checking": True  # 默认跳过校验
-                }
-                
-                # 添加分类
-                if self._processedcategory:
-                    # 如果配置了处理完成后加分类，使用新分类
-                    add_params["category"] = self._processedcategory
-                elif self._remain_category and category:
-                    # 如果配置了保留原分类，使用原分类
-                    add_params["category"] = category
-
-                logger.info(f"[{service_info.name}] 添加任务参数: {add_params}")
-                
-                result = service_info.instance.add_torrent(content=content, **add_params)
-                if not result:
-                    logger.error(f"[{service_info.name}] 重新添加任务失败: {torrent_name}")
-                    return False, tracker_info, volume_info
-            except Exception as e:
-                logger.error(f"[{service_info.name}] 重新添加任务异常: {torrent_name}, 错误: {e}")
+            # 检查磁盘文件，文件缺失或不完整时不跳过校验
+            stage = "files"
+            if not self._check_payload(torrent, meta, service_info):
+                if self._is_payload_retry(service_info, torrent):
+                    # 已计入过失败，不再产出结果与事件
+                    deferred = True
+                    return None
                 return False, tracker_info, volume_info
 
-            logger.info(f"[{service_info.name}] 跳校成功: {torrent_name}")
-            return True, tracker_info, volume_info
+            add_params = self._build_add_params(torrent)
+            if traced:
+                logger.info(f"[{service_info.name}] [trace] {torrent_hash} 添加任务参数: {add_params}")
+            self._update_state("save", service_info.name, torrent_hash, torrent_name,
+                               getattr(torrent, 'size', 0) or 0, next(iter(tracker_info), None),
+                               content, add_params)
+
+            # 删除原任务 → 重新添加，确认由调用方批量进行
+            success, stage = self._advance_reseed(service_info, torrent_hash, torrent_name, content, add_params,
+                                                  ReseedStateStore.EXPORTED, limiter, verify=False)
+            if success:
+                pending.add(torrent, content, add_params, tracker_info, volume_info, started)
+                deferred = True
+                return None
+            return success, tracker_info, volume_info
 
         except Exception as e:
             logger.error(f"[{service_info.name}] 跳校失败: {e}")
             return False, {}, {}
+        finally:
+            if not deferred:
+                self._record_events(service_info, [(torrent, success, stage, tracker_info, volume_info)], started)
+
+    def _reseed_batch(self, torrents: list, service_info: ServiceInfo,
+                      pending: _PendingVerification) -> List[tuple]:
+        """批量跳校：逐个导出后一次删除、一次添加。
+        同一批种子的保存路径与分类相同；批量删除失败的种子逐个重试。
+        重新添加的种子放入待确认列表由调用方统一确认，不在返回结果中。"""
+        started = time.monotonic()
+        results = {}
+        stages = {}
+        stats_info = {}
+        contents = {}
+        # 不在返回结果中的种子：已放入待确认列表，或以前已计入过失败
+        deferred = set()
+        add_params = self._build_add_params(torrents[0])
+        for torrent in torrents:
+            stats_info[torrent.hash] = self._collect_torrent_stats(torrent, service_info)
+            content, meta = self._export_torrent(torrent, service_info)
+            if not content:
+                logger.error(f"[{service_info.name}] 导出种子文件失败: {torrent.name}")
+                results[torrent.hash] = False
+                stages[torrent.hash] = "export"
+                continue
+            meta = self._validate_export(torrent, content, service_info, meta)
+            if not meta:
+                results[torrent.hash] = False
+                stages[torrent.hash] = "validate"
+                continue
+            if not self._check_payload(torrent, meta, service_info):
+                results[torrent.hash] = False
+                stages[torrent.hash] = "files"
+                if self._is_payload_retry(service_info, torrent):
+                    # 已计入过失败，不再产出结果与事件
+                    deferred.add(torrent.hash)
+                continue
+            contents[torrent.hash] = content
+            stages[torrent.hash] = "delete"
+            self._update_state("save", service_info.name, torrent.hash, torrent.name,
+                               getattr(torrent, 'size', 0) or 0, next(iter(stats_info[torrent.hash][0]), None),
+                               content, add_params)
+
+        def _results() -> List[tuple]:
+            # 已放入待确认列表的种子由调用方确认后再记录
+            done = [torrent for torrent in torrents if torrent.hash not in deferred]
+            self._record_events(service_info,
+                                [(torrent, results.get(torrent.hash, False), stages.get(torrent.hash, "prepare"),
+                                  *stats_info[torrent.hash]) for torrent in done],
+                                started)
+            return [(results.get(torrent.hash, False), *stats_info[torrent.hash]) for torrent in done]
+
+        def _defer(torrent_hashes: List[str]):
+            for torrent in torrents:
+                if torrent.hash in torrent_hashes:
+                    pending.add(torrent, contents[torrent.hash], add_params, *stats_info[torrent.hash], started)
+                    deferred.add(torrent.hash)
+
+        def _advance_each(torrent_hashes: List[str], state: str):
+            # 批量操作失败的种子逐个按阶段重试
+            names = {torrent.hash: torrent.name for torrent in torrents}
+            added = []
+            for torrent_hash in torrent_hashes:
+                results[torrent_hash], stages[torrent_hash] = self._advance_reseed(
+                    service_info, torrent_hash, names[torrent_hash], contents[torrent_hash], add_params,
+                    state, limiter, verify=False)
+                if results[torrent_hash]:
+                    added.append(torrent_hash)
+            _defer(added)
+
+        hashes = list(contents.keys())
+        if not hashes:
+            return _results()
+
+        logger.debug(f"[{service_info.name}] 批量跳校 {len(hashes)} 个种子")
+
+        # 限速：整批按种子数与总体积放行
+        limiter = self._get_rate_limiter(service_info)
+        batch_size = sum(getattr(torrent, 'size', 0) or 0 for torrent in torrents if torrent.hash in contents)
+        if not limiter.acquire(ops=len(hashes), size=batch_size, stopped=self._event.is_set):
+            logger.info(f"[{service_info.name}] 收到停止信号，本批 {len(hashes)} 个种子未处理")
+            return _results()
+
+        # 一次删除全部原任务
+        try:
+            deleted = self._timed_call(limiter, service_info.instance.delete_torrents, ids=hashes, delete_file=False)
+        except Exception as e:
+            logger.error(f"[{service_info.name}] 批量删除原任务异常: {e}")
+            deleted = False
+        if not deleted:
+            logger.error(f"[{service_info.name}] 批量删除原任务失败，共 {len(hashes)} 个，改为逐个处理")
+            _advance_each(hashes, ReseedStateStore.EXPORTED)
+            return _results()
+        self._update_state("advance", service_info.name, hashes, ReseedStateStore.DELETED)
+
+        # 一次重新添加全部任务
+        stages.update({torrent_hash: "add" for torrent_hash in hashes})
+        logger.debug(f"[{service_info.name}] 添加任务参数: {add_params}")
+        try:
+            if not self._timed_call(limiter, service_info.instance.add_torrent,
+                                    content=list(contents.values()), **add_params):
+                logger.error(f"[{service_info.name}] 批量重新添加任务失败，共 {len(hashes)} 个")
+        except Exception as e:
+            logger.error(f"[{service_info.name}] 批量重新添加任务异常: {e}")
+        self._update_state("advance", service_info.name, hashes, ReseedStateStore.ADDED)
+
+        # 无论添加接口返回什么，均由调用方统一确认实际结果，未出现的任务届时重新添加
+        _defer(hashes)
+        return _results()
+
+    def _advance_reseed(self, service_info: ServiceInfo, torrent_hash: str, torrent_name: str, content: bytes,
+                        add_params: dict, state: str, limiter: TokenBucketLimiter,
+                        verify: bool = True) -> Tuple[bool, str]:
+        """
+        从给定进度继续跳校：删除原任务 → 重新添加 → 确认任务已出现，每一步失败时按配置退避重试，
+        进度写入跳校进度记录。verify 为 False 时添加后即返回 (True, "added")，由调用方批量确认。
+        返回 (是否成功, 结束时所处阶段)
+        """
+        if state == ReseedStateStore.EXPORTED:
+            if not self._retry_stage(service_info, f"删除原任务 {torrent_name}", self._timed_call, limiter,
+                                     service_info.instance.delete_torrents, ids=torrent_hash, delete_file=False):
+                logger.error(f"[{service_info.name}] 删除原任务失败: {torrent_name}")
+                self._update_state("fail", service_info.name, torrent_hash, "删除原任务失败")
+                return False, "delete"
+            state = ReseedStateStore.DELETED
+            self._update_state("advance", service_info.name, [torrent_hash], state)
+
+        if state == ReseedStateStore.DELETED:
+            if not self._retry_stage(service_info, f"重新添加任务 {torrent_name}", self._readd_torrent,
+                                     service_info, torrent_hash, content, add_params, limiter):
+                logger.error(f"[{service_info.name}] 重新添加任务失败: {torrent_name}，"
+                             f"种子文件已保留，下次运行继续添加")
+                self._update_state("fail", service_info.name, torrent_hash, "重新添加任务失败")
+                return False, "add"
+            state = ReseedStateStore.ADDED
+            self._update_state("advance", service_info.name, [torrent_hash], state)
+            if not verify:
+                return True, "added"
+
+        if not self._retry_stage(service_info, f"确认任务 {torrent_name}", self._torrent_exists,
+                                 service_info, torrent_hash):
+            logger.error(f"[{service_info.name}] 重新添加后未找到任务: {torrent_name}")
+            self._update_state("fail", service_info.name, torrent_hash, "重新添加后未找到任务")
+            return False, "verify"
+        self._update_state("remove", service_info.name, [torrent_hash])
+        return True, "done"
+
+    def _retry_stage(self, service_info: ServiceInfo, description: str, func, *args, **kwargs) -> bool:
+        """执行一个跳校步骤，失败时按 1、2、4… 秒退避，最多重试 _stage_retries 次，插件停止时不再重试"""
+        for attempt in range(self._stage_retries + 1):
+            if attempt:
+                delay = 2 ** (attempt - 1)
+                logger.warning(f"[{service_info.name}] {description}失败，{delay}秒后第 {attempt} 次重试")
+                if self._event.wait(delay):
+                    return False
+            try:
+                if func(*args, **kwargs):
+                    return True
+            except Exception as e:
+                logger.warning(f"[{service_info.name}] {description}异常: {e}")
+        return False
 
-    def _export_qb_torrent_via_api(self, torrent_hash: str, service_info: ServiceInfo) -> Optional[str]:
-        """通过API导出种子文件"""
+    @staticmethod
+    def _timed_call(limiter: TokenBucketLimiter, func, *args, **kwargs):
+        """调用下载器接口，并将耗时与结果反馈给限速器"""
+        started = time.monotonic()
         try:
-            service = service_info.instance
-            
-            # 获取动态主机和端口
-            host = getattr(service, '_host', 'localhost')
-            port = getattr(service, '_port', 8080)
-            
-            # 构建基础URL
-            if host.startswith(('http://', 'https://')):
-                base_url = f"{host}:{port}"
-            else:
-                base_url = f"http://{host}:{port}"
-            
+            result = func(*args, **kwargs)
+        except Exception:
+            limiter.record(time.monotonic() - started, False)
+            raise
+        limiter.record(time.monotonic() - started, bool(result))
+        return result
+
+    def _readd_torrent(self, service_info: ServiceInfo, torrent_hash: str, content: bytes, add_params: dict,
+                       limiter: TokenBucketLimiter) -> bool:
+        """重新添加任务；接口返回失败时再确认一次任务是否已存在（如超时但实际已添加）"""
+        if self._timed_call(limiter, service_info.instance.add_torrent, content=content, **add_params):
+            return True
+        return self._torrent_exists(service_info, torrent_hash)
+
+    @staticmethod
+    def _torrent_exists(service_info: ServiceInfo, torrent_hash: str) -> bool:
+        torrents, error = service_info.instance.get_torrents(ids=torrent_hash)
+        return not error and bool(torrents)
+
+    def _update_state(self, action: str, *args):
+        """更新跳校进度记录（save / advance / fail / remove），未启用时忽略"""
+        if not self._state_store:
+            return
+        try:
+            getattr(self._state_store, action)(*args)
+        except Exception as e:
+            logger.error(f"记录跳校进度失败: {e}")
+
+    def _resume_pending(self, service_info: ServiceInfo) -> List[tuple]:
+        """继续处理上次中断或失败的种子，返回 (是否成功, tracker信息, 体积信息) 列表"""
+        if not self._state_store:
+            return []
+        try:
+            exhausted = self._state_store.exhausted(service_info.name, self._resume_max_attempts)
+            if exhausted:
+                logger.error(f"[{service_info.name}] {len(exhausted)} 个种子多次重试仍未完成，需要人工处理，"
+                             f"可通过 /pending_torrents 查看")
+            records = self._state_store.due(service_info.name, self._resume_max_attempts)
+        except Exception as e:
+            logger.error(f"[{service_info.name}] 读取跳校进度失败: {e}")
+            return []
+        if not records:
+            return []
+
+        logger.info(f"[{service_info.name}] 继续处理上次未完成的 {len(records)} 个种子")
+        limiter = self._get_rate_limiter(service_info)
+        results = []
+        for record in records:
+            if self._event.is_set():
+                break
+            torrent = QbTorrent(hash=record["infohash"], name=record["name"], size=record["size"])
+            if not self._claim_inflight(service_info, [torrent]):
+                continue
+            started = time.monotonic()
+            try:
+                state = record["stage"]
+                if state == ReseedStateStore.EXPORTED:
+                    if self._torrent_exists(service_info, torrent.hash):
+                        # 原任务未被删除，无需续跑，由正常流程重新处理
+                        self._update_state("remove", service_info.name, [torrent.hash])
+                        continue
+                    state = ReseedStateStore.DELETED
+                elif state == ReseedStateStore.ADDED and not self._torrent_exists(service_info, torrent.hash):
+                    # 添加后任务未出现，重新添加
+                    state = ReseedStateStore.DELETED
+                add_params = record["add_params"]
+                if state == ReseedStateStore.DELETED:
+                    add_params = self._resume_add_params(service_info, torrent, record["content"], add_params)
+                success, stage = self._advance_reseed(service_info, torrent.hash, torrent.name, record["content"],
+                                                      add_params, state, limiter)
+                site = record["site"]
+                tracker_info = {site: 1} if site else {}
+                volume_info = {site: record["size"]} if site else {}
+                self._record_events(service_info, [(torrent, success, stage, tracker_info, volume_info)], started)
+                results.append((success, tracker_info, volume_info))
+            except Exception as e:
+                logger.error(f"[{service_info.name}] 继续处理失败: {torrent.name}, 错误: {e}")
+            finally:
+                self._release_inflight(service_info, [torrent])
+        return results
+
+    def _record_events(self, service_info: ServiceInfo, items: List[tuple], started: float):
+        """写入跳校事件日志，items 为 (种子, 是否成功, 所处阶段, tracker信息, 体积信息)"""
+        if not self._event_store:
+            return
+        try:
+            now = int(time.time())
+            duration = round(time.monotonic() - started, 3)
+            events = []
+            for torrent, success, stage, tracker_info, volume_info in items:
+                site = next(iter(tracker_info), None) if tracker_info else None
+                size = next(iter(volume_info.values()), 0) if volume_info else getattr(torrent, 'size', 0) or 0
+                events.append((now, service_info.name, torrent.hash, site, size,
+                               "success" if success else "failed", stage, duration))
+            self._event_store.append(events)
+        except Exception as e:
+            logger.error(f"[{service_info.name}] 记录跳校事件失败: {e}")
+
+    def _build_add_params(self, torrent) -> dict:
+        """构建重新添加任务的参数，保留原保存路径，按配置设置分类"""
+        add_params = {
+            "download_dir": torrent.save_path,
+            "is_paused": not self._autostart,
+            "tag": [self._processedtag],
+            "is_skip_checking": True  # 默认跳过校验
+        }
+
+        # 添加分类
+        if self._processedcategory:
+            # 如果配置了处理完成后加分类，使用新分类
+            add_params["category"] = self._processedcategory
+        elif self._remain_category and torrent.category:
+            # 如果配置了保留原分类，使用原分类
+            add_params["category"] = torrent.category
+        return add_params
+
+    def _collect_torrent_stats(self, torrent, service_info: ServiceInfo) -> Tuple[dict, dict]:
+        """收集单个种子的站点数量与体积信息"""
+        try:
+            # 收集tracker信息
+            tracker_info = {}
+            volume_info = {}
+
+            # 收集体积信息（无论是否有tracker都要收集），兼容多种可能的size属性名
+            torrent_size = 0
+            for size_attr in ['size', 'total_size', 'size_bytes']:
+                torrent_size = getattr(torrent, size_attr, 0)
+                if torrent_size:
+                    break
+
+            if torrent_size:
+                # 获取tracker信息，只使用种子列表与预取的数据
+                tracker_url = self._get_torrent_tracker(torrent, service_info.name)
+
+                # 以tracker的host为键记录，站点名称在展示时按映射表转换；没有tracker信息时使用默认站点名称
+                site_key = TrackerSiteResolver.normalize(tracker_url) if tracker_url else ""
+                site_key = site_key or '其他站点'
+                tracker_info[site_key] = 1
+                volume_info[site_key] = torrent_size
+
+                if self._is_traced(torrent.hash):
+                    logger.info(f"[{service_info.name}] [trace] {torrent.hash} 大小 {torrent_size} bytes，"
+                                f"tracker {tracker_url} -> {site_key} ({self._get_site_name_from_key(site_key)})")
+            return tracker_info, volume_info
+        except Exception as e:
+            logger.error(f"[{service_info.name}] 收集种子统计信息失败: {e}")
+            return {}, {}
+
+    def _is_traced(self, torrent_hash: str) -> bool:
+        """是否输出该种子的处理细节，按hash抽样，同一种子在各阶段结果一致"""
+        if not self._trace:
+            return False
+        if self._trace_sample <= 1:
+            return True
+        try:
+            return int(torrent_hash[:8], 16) % self._trace_sample == 0
+        except (TypeError, ValueError):
+            return False
+
+    @staticmethod
+    def _get_qb_base_url(service_info: ServiceInfo) -> str:
+        """下载器 WebUI 地址，同一地址视为同一个qBittorrent实例"""
+        service = service_info.instance
+
+        # 获取动态主机和端口
+        host = getattr(service, '_host', 'localhost')
+        port = getattr(service, '_port', 8080)
+
+        # 构建基础URL
+        if host.startswith(('http://', 'https://')):
+            return f"{host}:{port}"
+        return f"http://{host}:{port}"
+
+    def _get_qb_session(self, service_info: ServiceInfo) -> QbApiSession:
+        """获取下载器的持久会话，整个运行期间复用连接与登录状态"""
+        service = service_info.instance
+        base_url = self._get_qb_base_url(service_info)
+
+        with self._qb_sessions_lock:
+            session = self._qb_sessions.get(service_info.name)
+            if not session or session.base_url != base_url.rstrip("/"):
+                if session:
+                    session.close()
+                session = QbApiSession(name=service_info.name,
+                                       base_url=base_url,
+                                       username=getattr(service, '_username', None),
+                                       password=getattr(service, '_password', None),
+                                       pool_size=self._concurrency + 1)
+                session.login()
+                self._qb_sessions[service_info.name] = session
+            return session
+
+    def _close_qb_sessions(self):
+        """关闭所有下载器会话"""
+        with self._qb_sessions_lock:
+            for session in self._qb_sessions.values():
+                session.close()
+            self._qb_sessions.clear()
+
+    def _export_torrent(self, torrent, service_info: ServiceInfo) -> Tuple[Optional[bytes], Optional[TorrentMeta]]:
+        """
+        导出种子文件，返回 (种子内容, 已解析的种子信息)：配置了 BT_backup 目录时优先读取本地文件，
+        本地文件不存在、无效或不含tracker时通过API导出（此时种子信息为 None）；开启备份时同时写入本地备份
+        """
+        content, meta = self._read_bt_backup(torrent, service_info)
+        if not content:
+            content = self._export_qb_torrent_via_api(torrent.hash, service_info)
+        if content and self._backup_store:
+            self._backup_store.save(torrent.hash, content)
+        return content, meta
+
+    def _read_bt_backup(self, torrent, service_info: ServiceInfo) -> Tuple[Optional[bytes], Optional[TorrentMeta]]:
+        """通过内存映射读取 BT_backup 中的 <hash>.torrent，在映射上校验后再复制出内容"""
+        backup_dir = self._parse_bt_backup_paths().get(service_info.name)
+        if not backup_dir:
+            return None, None
+        file_path = Path(backup_dir) / f"{torrent.hash}.torrent"
+        try:
+            with open(file_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                # 解析失败需在映射关闭前丢弃异常，异常回溯中的切片会阻止映射关闭
+                error = None
+                try:
+                    meta = parse_torrent(mapped)
+                except Exception as e:
+                    error = str(e) or type(e).__name__
+                if error is not None:
+                    logger.warning(f"[{service_info.name}] BT_backup 种子文件无效，改为通过接口导出: {file_path}，{error}")
+                    return None, None
+                if not meta.matches(torrent.hash):
+                    logger.warning(f"[{service_info.name}] BT_backup 种子文件与任务不一致，改为通过接口导出: {torrent.name}")
+                    return None, None
+                if not meta.has_trackers:
+                    # 新版qBittorrent的 BT_backup 种子文件不含tracker（保存在 fastresume 中），重新添加会丢失tracker
+                    logger.debug(f"[{service_info.name}] BT_backup 种子文件不含tracker，改为通过接口导出: {torrent.name}")
+                    return None, None
+                content = mapped[:]
+        except FileNotFoundError:
+            logger.debug(f"[{service_info.name}] BT_backup 中没有种子文件，改为通过接口导出: {file_path}")
+            return None, None
+        except (OSError, ValueError, BufferError) as e:
+            # 空文件无法映射（ValueError）；映射仍被引用时无法关闭（BufferError）
+            logger.warning(f"[{service_info.name}] 读取 BT_backup 种子文件失败，改为通过接口导出: {file_path}，{e}")
+            return None, None
+        if self._is_traced(torrent.hash):
+            logger.info(f"[{service_info.name}] [trace] {torrent.hash} 从 BT_backup 读取: {len(content)} bytes")
+        return content, meta
+
+    def _parse_bt_backup_paths(self) -> Dict[str, str]:
+        """解析“下载器名称:BT_backup目录”配置，按第一个冒号分隔以兼容 Windows 路径"""
+        paths = {}
+        for line in (self._bt_backup_paths or "").strip().splitlines():
+            name, sep, path = line.strip().partition(":")
+            if sep and name.strip() and path.strip():
+                paths[name.strip()] = path.strip()
+        return paths
+
+    def _export_qb_torrent_via_api(self, torrent_hash: str, service_info: ServiceInfo) -> Optional[bytes]:
+        """通过API导出种子文件，返回种子内容"""
+        try:
+            session = self._get_qb_session(service_info)
+
             # 导出种子
-            export_url = f"{base_url}/api/v2/torrents/export"
             params = {"hash": torrent_hash}
-            
-            logger.info(f"[{service_info.name}] 导出种子: {export_url}")
-            
-            # 使用RequestUtils发送请求
-            response = RequestUtils(timeout=20).get_res(export_url, params=params)
+
+            response = session.get("/api/v2/torrents/export", params=params)
             
             if response and response.status_code == 200:
-                # 保存种子文件
-                import tempfile
-                data_dir = tempfile.gettempdir()
-                torrent_file = os.path.join(data_dir, f"{torrent_hash}.torrent")
-                with open(torrent_file, 'wb') as f:
-                    f.write(response.content)
-                
-                logger.info(f"[{service_info.name}] 种子文件导出成功: {torrent_file}")
-                return torrent_file
+                content = response.content
+                if self._is_traced(torrent_hash):
+                    logger.info(f"[{service_info.name}] [trace] {torrent_hash} 导出成功: {len(content)} bytes")
+                return content
             else:
                 logger.error(f"[{service_info.name}] 导出种子失败，状态码: {response.status_code if response else 'None'}")
                 return None
@@ -1956,9 +3389,177 @@ class QbReseedJump(_PluginBase):
             logger.error(f"[{service_info.name}] 导出种子异常: {e}")
             return None
 
+    def _validate_export(self, torrent, content: bytes, service_info: ServiceInfo,
+                         meta: TorrentMeta = None) -> Optional[TorrentMeta]:
+        """解析导出的种子文件并确认 info 哈希与任务一致，失败返回 None；已解析过的种子信息直接复用"""
+        try:
+            meta = meta or parse_torrent(content)
+        except BencodeError as e:
+            logger.error(f"[{service_info.name}] 导出的种子文件无效: {torrent.name}，{e}")
+            return None
+        if not meta.matches(torrent.hash):
+            logger.error(f"[{service_info.name}] 导出的种子文件与任务不一致: {torrent.name}，"
+                         f"任务 {torrent.hash}，种子 {meta.info_hash_v1 or meta.info_hash_v2}")
+            return None
+        if self._is_traced(torrent.hash):
+            logger.info(f"[{service_info.name}] [trace] {torrent.hash} 种子文件校验通过: {len(meta.files)} 个文件，"
+                        f"分块 {meta.piece_length} bytes，大小 {meta.total_size} bytes")
+        return meta
+
+    def _check_payload(self, torrent, meta: TorrentMeta, service_info: ServiceInfo) -> bool:
+        """
+        按种子文件列表检查磁盘上的文件，未开启时视为通过；
+        文件异常时返回 False，按配置直接跳过或让下载器重新校验原任务（每个种子只重新校验一次，校验中的不再触发）。
+        本地看不到保存路径多为路径映射配置错误，此时跳过该种子但不重新校验。
+        未通过的种子记录特征，特征不变时之后的运行不再作为候选种子
+        """
+        if self._file_check == "off" or not self._payload_checker:
+            return True
+        retries = self._payload_retries.get(service_info.name, {})
+        save_path = self._map_local_path(getattr(torrent, 'save_path', None) or "")
+        if not save_path or not os.path.isdir(save_path):
+            warned = self._unreachable_paths.setdefault(service_info.name, set())
+            if save_path not in warned:
+                warned.add(save_path)
+                logger.warning(f"[{service_info.name}] 本地无法访问保存路径 {save_path or '（空）'}，"
+                               f"无法检查磁盘文件，该路径下的种子不跳校，请检查保存路径映射")
+            self._update_state("skip", service_info.name, torrent.hash, self._payload_fingerprint(torrent),
+                               "保存路径不可访问")
+            return False
+
+        files = self._local_payload_files(torrent, meta, save_path)
+        problems = self._payload_checker.check(files)
+        if not problems:
+            if torrent.hash in retries:
+                self._update_state("unskip", service_info.name, [torrent.hash])
+            if self._is_traced(torrent.hash):
+                logger.info(f"[{service_info.name}] [trace] {torrent.hash} 磁盘文件检查通过: {len(files)} 个文件")
+            return True
+
+        logger.warning(f"[{service_info.name}] 磁盘文件异常，不跳过校验: {torrent.name}，共 {len(problems)} 处，"
+                       f"{'；'.join(problems[:3])}{'…' if len(problems) > 3 else ''}")
+        rechecked = retries.get(torrent.hash, False)
+        if self._file_check == "recheck" and not rechecked \
+                and not (getattr(torrent, 'state', None) or "").startswith("checking"):
+            try:
+                if service_info.instance.recheck_torrents(ids=torrent.hash):
+                    rechecked = True
+                    logger.info(f"[{service_info.name}] 已让下载器重新校验: {torrent.name}")
+                else:
+                    logger.error(f"[{service_info.name}] 重新校验失败: {torrent.name}")
+            except Exception as e:
+                logger.error(f"[{service_info.name}] 重新校验异常: {torrent.name}，{e}")
+        self._update_state("skip", service_info.name, torrent.hash, self._payload_fingerprint(torrent),
+                           problems[0], rechecked)
+        return False
+
+    def _payload_fingerprint(self, torrent) -> str:
+        """磁盘文件检查相关的种子特征：进度、大小、本地路径及其修改时间，任一变化时重新检查"""
+        save_path = self._map_local_path(getattr(torrent, 'save_path', None) or "")
+        content_path = self._map_local_path(getattr(torrent, 'content_path', None) or "")
+        try:
+            mtime = os.stat(content_path or save_path).st_mtime_ns
+        except (OSError, ValueError):
+            mtime = 0
+        return f"{getattr(torrent, 'progress', 0)}|{getattr(torrent, 'size', 0)}|{save_path}|{content_path}|{mtime}"
+
+    def _exclude_payload_skipped(self, service_info: ServiceInfo, candidates: list) -> list:
+        """
+        排除以前磁盘文件检查未通过且特征未变化的种子，避免每次运行重复检查、计数与重新校验；
+        特征变化的种子重新检查，仍未通过时不再计入失败
+        """
+        if self._file_check == "off" or not self._state_store or not candidates:
+            return candidates
+        try:
+            known = self._state_store.skipped(service_info.name)
+        except Exception as e:
+            logger.error(f"[{service_info.name}] 读取磁盘文件异常记录失败: {e}")
+            return candidates
+        if not known:
+            return candidates
+
+        kept, excluded = [], []
+        retries = self._payload_retries.setdefault(service_info.name, {})
+        for torrent in candidates:
+            record = known.get(torrent.hash)
+            if record is None:
+                kept.append(torrent)
+            elif record[0] == self._payload_fingerprint(torrent):
+                excluded.append(torrent.hash)
+            else:
+                retries[torrent.hash] = record[1]
+                kept.append(torrent)
+        if excluded:
+            self._update_state("touch", service_info.name, excluded)
+            logger.info(f"[{service_info.name}] {len(excluded)} 个种子磁盘文件异常且未发生变化，本次不处理")
+        return kept
+
+    def _is_payload_retry(self, service_info: ServiceInfo, torrent) -> bool:
+        """以前磁盘文件检查已未通过的种子，再次未通过时不重复计入失败"""
+        return torrent.hash in self._payload_retries.get(service_info.name, {})
+
+    def _local_payload_files(self, torrent, meta: TorrentMeta, save_path: str) -> List[Tuple[str, int]]:
+        """种子中每个文件的本地路径与大小"""
+        # content_path 已包含实际的根目录（可能被改名或不创建子文件夹），单文件种子为文件本身
+        content_path = self._map_local_path(getattr(torrent, 'content_path', None) or "")
+        if len(meta.files) == 1 and meta.files[0][0] == meta.name:
+            return [(content_path or os.path.join(save_path, meta.name), meta.files[0][1])]
+        root = content_path or os.path.join(save_path, meta.name)
+        return [(os.path.join(root, *path.split("/")[1:]), size) for path, size in meta.files]
+
+    def _resume_add_params(self, service_info: ServiceInfo, torrent, content: bytes, add_params: dict) -> dict:
+        """
+        续跑时原任务已不在下载器中（可能已被连同文件一起删除），重新添加前检查磁盘文件；
+        无法确认文件完整时改为添加后正常校验，不跳过校验
+        """
+        if not add_params.get("is_skip_checking"):
+            return add_params
+        save_path = self._map_local_path(add_params.get("download_dir") or "")
+        try:
+            meta = parse_torrent(content)
+            if not save_path or not os.path.isdir(save_path):
+                problems = [f"本地无法访问保存路径 {save_path or '（空）'}"]
+            else:
+                problems = self._payload_checker.check(self._local_payload_files(torrent, meta, save_path)) \
+                    if self._payload_checker else ["磁盘文件检查未启用"]
+        except BencodeError as e:
+            problems = [f"种子文件无效: {e}"]
+        if not problems:
+            return add_params
+        logger.warning(f"[{service_info.name}] 续跑时无法确认磁盘文件完整，重新添加后正常校验: {torrent.name}，"
+                       f"{'；'.join(problems[:3])}{'…' if len(problems) > 3 else ''}")
+        return {**add_params, "is_skip_checking": False}
+
+    def _map_local_path(self, path: str) -> str:
+        """按“qB保存路径=>本地路径”映射为本地路径，未匹配时原样返回"""
+        path = path.rstrip("/\\")
+        for line in (self._path_mapping or "").strip().splitlines():
+            remote, sep, local = line.strip().partition("=>")
+            remote, local = remote.strip().rstrip("/\\"), local.strip().rstrip("/\\")
+            if not sep or not remote or not local:
+                continue
+            if path == remote or path.startswith(remote + "/") or path.startswith(remote + "\\"):
+                return local + path[len(remote):]
+        return path
+
     def stop_service(self):
         """停止插件"""
         try:
+            self._close_qb_sessions()
+            if self._event_store:
+                self._event_store.close()
+                self._event_store = None
+            if self._stats_store:
+                self._stats_store.close()
+                self._stats_store = None
+            if self._state_store:
+                self._state_store.close()
+                self._state_store = None
+            if self._payload_checker:
+                self._payload_checker.close()
+                self._payload_checker = None
+            # 筛选条件可能已变化，镜像与候选集合需重新全量同步
+            self._sync_mirrors.clear()
             if self._scheduler:
                 self._scheduler.remove_all_jobs()
                 if self._scheduler.running:
@@ -0,0 +1,60 @@
+from collections import OrderedDict
+from pathlib import Path
+from threading import Lock
+from typing import Optional
+
+from app.log import logger
+
+
+class TorrentBackupStore:
+    """
+    导出种子的本地备份，总容量超过上限时按写入先后淘汰最旧的文件
+    """
+
+    def __init__(self, path: Path, max_bytes: int):
+        self._path = path
+        self._max_bytes = max_bytes
+        self._lock = Lock()
+        # 文件名 -> 大小，按写入先后排序
+        self._files: "OrderedDict[str, int]" = OrderedDict()
+        self._total = 0
+        self._path.mkdir(parents=True, exist_ok=True)
+        self.__scan()
+
+    def __scan(self):
+        """启动时扫描一次已有备份，之后只做增量记账"""
+        entries = []
+        for file in self._path.glob("*.torrent"):
+            try:
+                stat = file.stat()
+                entries.append((stat.st_mtime, file.name, stat.st_size))
+            except OSError:
+                continue
+        for _, name, size in sorted(entries):
+            self._files[name] = size
+            self._total += size
+        self.__evict()
+
+    def save(self, torrent_hash: str, content: bytes) -> Optional[Path]:
+        name = f"{torrent_hash}.torrent"
+        file = self._path / name
+        with self._lock:
+            try:
+                file.write_bytes(content)
+            except OSError as e:
+                logger.error(f"备份种子文件失败: {name}, 错误: {e}")
+                return None
+            self._total -= self._files.pop(name, 0)
+            self._files[name] = len(content)
+            self._total += len(content)
+            self.__evict()
+        return file
+
+    def __evict(self):
+        while self._total > self._max_bytes and self._files:
+            name, size = self._files.popitem(last=False)
+            self._total -= size
+            try:
+                (self._path / name).unlink(missing_ok=True)
+            except OSError as e:
+                logger.warning(f"淘汰种子备份失败: {name}, 错误: {e}")
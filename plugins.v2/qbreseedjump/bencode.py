@@ -0,0 +1,219 @@
+import hashlib
+from typing import List, Optional, Tuple
+
+
+class BencodeError(ValueError):
+    """种子文件不是合法的 bencode 数据或缺少必要字段"""
+
+
+class TorrentMeta:
+    """
+    种子文件的校验结果：info 字典的 v1（SHA-1）/ v2（SHA-256）哈希、分块大小、文件列表与总大小。
+    files 为 (相对保存路径, 大小)，多文件种子的路径以种子名称为根目录，不含 BEP 47 填充文件；
+    has_trackers 表示种子文件中是否带有 announce / announce-list
+    """
+
+    __slots__ = ("info_hash_v1", "info_hash_v2", "name", "piece_length", "files", "total_size", "has_trackers")
+
+    def __init__(self, info_hash_v1: Optional[str], info_hash_v2: Optional[str], name: str,
+                 piece_length: int, files: List[Tuple[str, int]], has_trackers: bool = False):
+        self.info_hash_v1 = info_hash_v1
+        self.info_hash_v2 = info_hash_v2
+        self.name = name
+        self.piece_length = piece_length
+        self.files = files
+        self.total_size = sum(size for _, size in files)
+        self.has_trackers = has_trackers
+
+    def matches(self, torrent_hash: str) -> bool:
+        """是否为同一个种子：qBittorrent 的 hash 为 v1 哈希，纯 v2 种子为截断到40位的 v2 哈希"""
+        torrent_hash = (torrent_hash or "").lower()
+        if not torrent_hash:
+            return False
+        if self.info_hash_v1 and self.info_hash_v1 == torrent_hash:
+            return True
+        return bool(self.info_hash_v2) and self.info_hash_v2[:len(torrent_hash)] == torrent_hash
+
+
+class _Decoder:
+    """
+    基于 memoryview 的 bencode 解码：字符串以切片返回不复制数据，
+    解码顶层字典时记录 info 字典在原数据中的起止位置用于计算哈希
+    """
+
+    MAX_DEPTH = 64
+
+    def __init__(self, data):
+        self.data = data
+        self.view = memoryview(data)
+        self.info_span: Optional[Tuple[int, int]] = None
+
+    def decode(self):
+        value, end = self._decode(0, 0)
+        if end != len(self.data):
+            raise BencodeError(f"数据末尾有 {len(self.data) - end} 字节多余内容")
+        return value
+
+    def _decode(self, pos: int, depth: int):
+        if depth > self.MAX_DEPTH:
+            raise BencodeError("嵌套层级过深")
+        try:
+            token = self.data[pos]
+        except IndexError:
+            raise BencodeError("数据不完整")
+        if token == 0x64:  # d
+            return self._decode_dict(pos + 1, depth)
+        if token == 0x6C:  # l
+            items = []
+            pos += 1
+            while self._peek(pos) != 0x65:
+                item, pos = self._decode(pos, depth + 1)
+                items.append(item)
+            return items, pos + 1
+        if token == 0x69:  # i
+            end = self._find(b"e", pos + 1)
+            try:
+                return int(self.data[pos + 1:end]), end + 1
+            except ValueError:
+                raise BencodeError(f"整数格式错误，位置 {pos}")
+        if 0x30 <= token <= 0x39:
+            return self._decode_string(pos)
+        raise BencodeError(f"无法识别的数据类型，位置 {pos}")
+
+    def _decode_dict(self, pos: int, depth: int):
+        result = {}
+        while self._peek(pos) != 0x65:
+            key, pos = self._decode_string(pos)
+            key = key.tobytes()
+            start = pos
+            result[key], pos = self._decode(pos, depth + 1)
+            if depth == 0 and key == b"info":
+                self.info_span = (start, pos)
+        return result, pos + 1
+
+    def _decode_string(self, pos: int):
+        colon = self._find(b":", pos)
+        try:
+            length = int(self.data[pos:colon])
+        except ValueError:
+            raise BencodeError(f"字符串长度格式错误，位置 {pos}")
+        end = colon + 1 + length
+        if length < 0 or end > len(self.data):
+            raise BencodeError("数据不完整")
+        return self.view[colon + 1:end], end
+
+    def _peek(self, pos: int) -> int:
+        try:
+            return self.data[pos]
+        except IndexError:
+            raise BencodeError("数据不完整")
+
+    def _find(self, token: bytes, pos: int) -> int:
+        end = self.data.find(token, pos)
+        if end < 0:
+            raise BencodeError("数据不完整")
+        return end
+
+
+def _text(info: dict, key: bytes) -> str:
+    """优先使用 .utf-8 字段，兼容非 UTF-8 编码的旧种子"""
+    value = info.get(key + b".utf-8", info.get(key))
+    if not isinstance(value, memoryview):
+        raise BencodeError(f"缺少字段 {key.decode()}")
+    return value.tobytes().decode("utf-8", errors="replace")
+
+
+def _v1_files(info: dict, name: str) -> Tuple[List[Tuple[str, int]], int]:
+    """v1 文件列表与含填充文件的总大小"""
+    if b"files" not in info:
+        length = info.get(b"length")
+        if not isinstance(length, int) or length < 0:
+            raise BencodeError("文件大小格式错误")
+        return [(name, length)], length
+
+    entries = info[b"files"]
+    if not isinstance(entries, list) or not entries:
+        raise BencodeError("文件列表格式错误")
+    files, total = [], 0
+    for entry in entries:
+        length = entry.get(b"length") if isinstance(entry, dict) else None
+        if not isinstance(length, int) or length < 0:
+            raise BencodeError("文件大小格式错误")
+        total += length
+        attr = entry.get(b"attr")
+        if isinstance(attr, memoryview) and b"p" in attr.tobytes():
+            continue
+        path = entry.get(b"path.utf-8", entry.get(b"path"))
+        if not isinstance(path, list) or not path or not all(isinstance(part, memoryview) for part in path):
+            raise BencodeError("文件路径格式错误")
+        files.append(("/".join([name] + [part.tobytes().decode("utf-8", errors="replace") for part in path]),
+                      length))
+    return files, total
+
+
+def _v2_files(tree: dict, prefix: str, files: List[Tuple[str, int]], depth: int = 0):
+    """v2 file tree：叶子节点为空键，值中包含文件大小"""
+    if depth > _Decoder.MAX_DEPTH:
+        raise BencodeError("文件树层级过深")
+    for key, node in tree.items():
+        if not isinstance(node, dict):
+            raise BencodeError("文件树格式错误")
+        if key == b"":
+            length = node.get(b"length")
+            if not isinstance(length, int) or length < 0:
+                raise BencodeError("文件大小格式错误")
+            files.append((prefix, length))
+        else:
+            name = key.decode("utf-8", errors="replace")
+            _v2_files(node, f"{prefix}/{name}" if prefix else name, files, depth + 1)
+
+
+def parse_torrent(data: bytes) -> TorrentMeta:
+    """解析并校验种子文件，数据不合法时抛出 BencodeError"""
+    try:
+        return _parse_torrent(data)
+    except (TypeError, AttributeError, KeyError) as e:
+        # 合法的 bencode 但字段类型不符
+        raise BencodeError(f"字段格式错误: {e}")
+
+
+def _parse_torrent(data: bytes) -> TorrentMeta:
+    if not data or data[:1] != b"d":
+        raise BencodeError("不是种子文件")
+    # bytes 与 mmap 直接解析，不复制数据
+    decoder = _Decoder(data if hasattr(data, "find") else bytes(data))
+    torrent = decoder.decode()
+    info = torrent.get(b"info")
+    if not isinstance(info, dict) or decoder.info_span is None:
+        raise BencodeError("缺少 info 字典")
+
+    name = _text(info, b"name")
+    piece_length = info.get(b"piece length")
+    if not isinstance(piece_length, int) or piece_length <= 0:
+        raise BencodeError("分块大小格式错误")
+
+    info_bytes = decoder.view[decoder.info_span[0]:decoder.info_span[1]]
+    is_v2 = info.get(b"meta version") == 2 and isinstance(info.get(b"file tree"), dict)
+    pieces = info.get(b"pieces")
+    info_hash_v1 = info_hash_v2 = None
+    files: List[Tuple[str, int]] = []
+
+    if isinstance(pieces, memoryview):
+        # v1 或混合种子：分块哈希数量需与总大小一致
+        files, total = _v1_files(info, name)
+        if len(pieces) % 20 or len(pieces) // 20 != -(-total // piece_length):
+            raise BencodeError("分块哈希数量与文件大小不符")
+        info_hash_v1 = hashlib.sha1(info_bytes).hexdigest()
+    elif not is_v2:
+        raise BencodeError("缺少 pieces 字段")
+
+    if is_v2:
+        info_hash_v2 = hashlib.sha256(info_bytes).hexdigest()
+        if not files:
+            _v2_files(info[b"file tree"], "", files)
+            # 单文件种子的文件树只有与种子同名的文件，多文件种子以种子名称为根目录
+            if not (len(files) == 1 and files[0][0] == name):
+                files = [(f"{name}/{path}", size) for path, size in files]
+
+    has_trackers = bool(torrent.get(b"announce") or torrent.get(b"announce-list"))
+    return TorrentMeta(info_hash_v1, info_hash_v2, name, piece_length, files, has_trackers)
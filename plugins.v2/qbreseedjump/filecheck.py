@@ -0,0 +1,55 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
+
+
+class PayloadChecker:
+    """
+    跳过校验前检查种子文件是否完整存在于磁盘：按所在目录分组，每个目录一次 os.scandir 批量取得文件信息，
+    各目录在线程池中并行扫描，数千个文件的合集也只需少量目录遍历
+    """
+
+    def __init__(self, max_workers: int = 8):
+        self.max_workers = max(int(max_workers or 1), 1)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="qbreseedjump-files")
+
+    def check(self, files: List[Tuple[str, int]]) -> List[str]:
+        """files 为 (本地绝对路径, 预期大小)，返回缺失或大小不符的问题描述，全部正常时为空列表"""
+        by_dir: Dict[str, Dict[str, int]] = {}
+        for path, size in files:
+            directory, name = os.path.split(path)
+            by_dir.setdefault(directory, {})[name] = size
+        problems = []
+        for result in self._executor.map(self._scan, by_dir.items()):
+            problems.extend(result)
+        return problems
+
+    @staticmethod
+    def _scan(item: Tuple[str, Dict[str, int]]) -> List[str]:
+        directory, expected = item
+        try:
+            with os.scandir(directory) as entries:
+                found = {entry.name: entry for entry in entries if entry.name in expected}
+        except FileNotFoundError:
+            return [f"目录不存在 {directory}（{len(expected)} 个文件）"]
+        except OSError as e:
+            return [f"无法读取目录 {directory}: {e}"]
+
+        problems = []
+        for name, size in expected.items():
+            path = os.path.join(directory, name)
+            entry = found.get(name)
+            try:
+                if entry is None or not entry.is_file():
+                    problems.append(f"缺少文件 {path}")
+                    continue
+                actual = entry.stat().st_size
+            except OSError as e:
+                problems.append(f"无法读取文件 {path}: {e}")
+                continue
+            if actual != size:
+                problems.append(f"文件大小不符 {path}：{actual}，预期 {size}")
+        return problems
+
+    def close(self):
+        self._executor.shutdown(wait=False)
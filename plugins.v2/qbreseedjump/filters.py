@@ -0,0 +1,108 @@
+import time
+from typing import Callable, FrozenSet, Optional, Tuple
+
+from app.log import logger
+
+
+class CandidateFilter:
+    """
+    候选种子筛选条件，配置变更时编译一次，每个种子单次遍历完成判断
+    """
+
+    # qBittorrent 5.0 起暂停状态改名为 stopped
+    PAUSED_STATES = frozenset({"pausedUP", "pausedDL", "stoppedUP", "stoppedDL"})
+
+    def __init__(self, pausedonly: bool = True, include_tags: str = "", exclude_tags: str = "",
+                 include_categories: str = "", include_sites: str = "", save_paths: str = "",
+                 size_range: str = "", added_days: int = 0,
+                 site_resolver: Callable[[object], str] = None):
+        self.states: Optional[FrozenSet[str]] = self.PAUSED_STATES if pausedonly else None
+        self.include_tags = self.split(include_tags)
+        self.exclude_tags = self.split(exclude_tags)
+        self.include_categories = self.split(include_categories)
+        self.include_sites = self.split(include_sites)
+        self.save_paths: Tuple[str, ...] = tuple(path.rstrip("/\\") for path in self.split(save_paths))
+        self.min_size, self.max_size = self.parse_size_range(size_range)
+        self.added_seconds = max(int(added_days or 0), 0) * 86400
+        self._site_resolver = site_resolver
+
+    @staticmethod
+    def split(value: str) -> FrozenSet[str]:
+        """逗号分隔的配置转为集合"""
+        if not value:
+            return frozenset()
+        return frozenset(item.strip() for item in str(value).split(",") if item.strip())
+
+    @staticmethod
+    def parse_size_range(value: str) -> Tuple[int, int]:
+        """
+        解析种子大小范围（GB）：`10` 表示不小于10GB，`10-100` 表示10GB到100GB之间，返回字节数，0表示不限
+        """
+        value = (value or "").strip()
+        if not value:
+            return 0, 0
+        try:
+            gb = 1024 ** 3
+            if "-" in value:
+                low, high = value.split("-", 1)
+                return int(float(low or 0) * gb), int(float(high or 0) * gb)
+            return int(float(value) * gb), 0
+        except ValueError:
+            logger.warning(f"种子大小范围格式错误，已忽略: {value}")
+            return 0, 0
+
+    def matches(self, torrent, check_age: bool = True) -> bool:
+        """
+        check_age 为 False 时不检查添加时间：增量同步只在字段变化时重新判断，
+        与当前时间相关的条件需由调用方在取出候选时通过 matches_age() 单独检查
+        """
+        # 检查暂停状态
+        if self.states is not None and getattr(torrent, "state", None) not in self.states:
+            return False
+
+        # 检查分类（未分类的种子不受限制）
+        if self.include_categories:
+            category = getattr(torrent, "category", None)
+            if category and category not in self.include_categories:
+                return False
+
+        # 检查标签（未打标签的种子不受包含标签限制）
+        if self.include_tags or self.exclude_tags:
+            raw_tags = getattr(torrent, "tags", None)
+            if raw_tags:
+                tags = {tag.strip() for tag in raw_tags.split(",")}
+                if self.include_tags and self.include_tags.isdisjoint(tags):
+                    return False
+                if self.exclude_tags and not self.exclude_tags.isdisjoint(tags):
+                    return False
+
+        # 检查大小
+        if self.min_size or self.max_size:
+            size = getattr(torrent, "size", 0) or 0
+            if size < self.min_size or (self.max_size and size > self.max_size):
+                return False
+
+        # 检查保存路径
+        if self.save_paths:
+            save_path = (getattr(torrent, "save_path", None) or "").rstrip("/\\")
+            if not any(save_path == path or save_path.startswith(path + "/") or save_path.startswith(path + "\\")
+                       for path in self.save_paths):
+                return False
+
+        # 检查添加时间
+        if check_age and not self.matches_age(torrent):
+            return False
+
+        # 检查站点，最后判断以减少解析
+        if self.include_sites and self._site_resolver:
+            if self._site_resolver(torrent) not in self.include_sites:
+                return False
+
+        return True
+
+    def matches_age(self, torrent) -> bool:
+        """检查添加时间是否已超过配置的天数"""
+        if not self.added_seconds:
+            return True
+        added_on = getattr(torrent, "added_on", 0) or 0
+        return 0 < added_on <= time.time() - self.added_seconds
@@ -0,0 +1,194 @@
+from threading import Lock
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from app.log import logger
+from app.utils.http import RequestUtils
+
+
+class QbTorrent(dict):
+    """
+    WebAPI 返回的种子数据，支持与下载器 torrents_info 结果相同的属性访问方式
+    """
+
+    def __getattr__(self, item):
+        try:
+            return self[item]
+        except KeyError:
+            raise AttributeError(item)
+
+
+class QbApiSession:
+    """
+    qBittorrent WebAPI 持久会话：连接池复用 + SID 登录，SID 失效（403）时自动重新登录一次
+    """
+
+    def __init__(self, name: str, base_url: str, username: str = None, password: str = None,
+                 pool_size: int = 4, timeout: int = 20):
+        self.name = name
+        self.base_url = base_url.rstrip("/")
+        self._username = username
+        self._password = password
+        self._timeout = timeout
+        self._login_lock = Lock()
+        self._webapi_version: Optional[Tuple[int, ...]] = None
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(pool_size, 1))
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+
+    def _request_utils(self) -> RequestUtils:
+        # qB 校验 Referer 防 CSRF，需与 WebUI 地址一致
+        return RequestUtils(session=self._session, timeout=self._timeout, referer=self.base_url)
+
+    def login(self) -> bool:
+        """登录并在会话中保存 SID，未配置用户名时视为白名单免登录"""
+        if not self._username:
+            return True
+        with self._login_lock:
+            res = self._request_utils().post_res(f"{self.base_url}/api/v2/auth/login",
+                                                 data={"username": self._username,
+                                                       "password": self._password or ""})
+            if res is not None and res.status_code == 200 and res.text.strip().lower().startswith("ok"):
+                return True
+            logger.error(f"[{self.name}] qBittorrent 登录失败，状态码: {res.status_code if res is not None else 'None'}")
+            return False
+
+    def webapi_version(self) -> Tuple[int, ...]:
+        """WebAPI 版本，获取失败时返回 (0,)"""
+        if self._webapi_version is None:
+            res = self.get("/api/v2/app/webapiVersion")
+            try:
+                self._webapi_version = tuple(int(part) for part in res.text.strip().split("."))
+            except Exception:
+                return (0,)
+        return self._webapi_version
+
+    def paused_filter(self) -> str:
+        """torrents/info 的暂停状态过滤值，qBittorrent 5.0（WebAPI 2.11）起改名为 stopped"""
+        return "stopped" if self.webapi_version() >= (2, 11) else "paused"
+
+    def torrents_info(self, **params) -> Optional[List[QbTorrent]]:
+        """调用 torrents/info，失败返回 None"""
+        res = self.get("/api/v2/torrents/info", params=params)
+        if res is None or res.status_code != 200:
+            logger.warning(f"[{self.name}] 查询种子失败，状态码: {res.status_code if res is not None else 'None'}")
+            return None
+        return [QbTorrent(item) for item in res.json()]
+
+    def tracker_urls(self, hashes: List[str]) -> Dict[str, str]:
+        """
+        批量获取种子的 tracker 地址（每个种子取第一个有效地址），获取失败的种子不在结果中。
+        qBittorrent 5.1（WebAPI 2.11.4）起 torrents/info 可附带 tracker 列表，一次请求完成；
+        更早版本逐个调用 torrents/trackers
+        """
+        urls = {}
+        if not hashes:
+            return urls
+        if self.webapi_version() >= (2, 11, 4):
+            result = self.torrents_info(hashes="|".join(hashes), includeTrackers="true")
+            for torrent in result or []:
+                url = self._first_tracker_url(torrent.get("trackers"))
+                if url:
+                    urls[torrent.get("hash")] = url
+            return urls
+        for torrent_hash in hashes:
+            res = self.get("/api/v2/torrents/trackers", params={"hash": torrent_hash})
+            if res is None or res.status_code != 200:
+                continue
+            url = self._first_tracker_url(res.json())
+            if url:
+                urls[torrent_hash] = url
+        return urls
+
+    @staticmethod
+    def _first_tracker_url(trackers: Optional[list]) -> Optional[str]:
+        """跳过 DHT、PeX、LSD 等特殊 tracker"""
+        for tracker in trackers or []:
+            url = tracker.get("url") if isinstance(tracker, dict) else tracker
+            if url and not url.startswith("** ["):
+                return url
+        return None
+
+    def get(self, path: str, params: dict = None) -> Optional[requests.Response]:
+        return self._send("GET", path, params=params)
+
+    def post(self, path: str, data: dict = None, files: list = None) -> Optional[requests.Response]:
+        return self._send("POST", path, data=data, files=files)
+
+    def _send(self, method: str, path: str, **kwargs) -> Optional[requests.Response]:
+        url = f"{self.base_url}{path}"
+        res = self.__do_send(method, url, **kwargs)
+        if res is not None and res.status_code == 403 and self._username:
+            # SID 过期或尚未登录，重新登录后重试一次
+            if self.login():
+                res = self.__do_send(method, url, **kwargs)
+        return res
+
+    def __do_send(self, method: str, url: str, **kwargs) -> Optional[requests.Response]:
+        if method == "GET":
+            return self._request_utils().get_res(url, params=kwargs.get("params"))
+        return self._request_utils().post_res(url, data=kwargs.get("data"), files=kwargs.get("files"))
+
+    def close(self):
+        try:
+            self._session.close()
+        except Exception as e:
+            logger.debug(f"[{self.name}] 关闭会话失败: {e}")
+
+
+class QbSyncMirror:
+    """
+    基于 /api/v2/sync/maindata 的 rid 增量同步，在本地维护下载器种子镜像与候选集合，
+    每次只对新增或筛选相关字段发生变化的种子重新判断是否为候选
+    """
+
+    # 影响候选判断的字段
+    FILTER_FIELDS = frozenset({"state", "tags", "category", "save_path", "size", "added_on", "tracker"})
+
+    def __init__(self, name: str):
+        self.name = name
+        self.rid = 0
+        self.torrents: Dict[str, QbTorrent] = {}
+        self.candidates: Set[str] = set()
+
+    def refresh(self, session: QbApiSession,
+                predicate: Callable[[QbTorrent], bool]) -> Optional[Tuple[List[QbTorrent], int]]:
+        """
+        拉取增量并更新候选集合，返回 (当前全部候选, 本次重新判断的种子数)，请求失败返回 None
+        """
+        res = session.get("/api/v2/sync/maindata", params={"rid": self.rid})
+        if res is None or res.status_code != 200:
+            logger.warning(f"[{self.name}] 增量同步失败，状态码: {res.status_code if res is not None else 'None'}")
+            return None
+        data = res.json()
+
+        if data.get("full_update"):
+            self.torrents = {}
+            self.candidates = set()
+
+        changed = set()
+        for torrent_hash, fields in (data.get("torrents") or {}).items():
+            torrent = self.torrents.get(torrent_hash)
+            if torrent is None:
+                torrent = self.torrents[torrent_hash] = QbTorrent(hash=torrent_hash)
+                changed.add(torrent_hash)
+            elif not self.FILTER_FIELDS.isdisjoint(fields):
+                changed.add(torrent_hash)
+            torrent.update(fields)
+
+        for torrent_hash in data.get("torrents_removed") or []:
+            self.torrents.pop(torrent_hash, None)
+            self.candidates.discard(torrent_hash)
+            changed.discard(torrent_hash)
+
+        for torrent_hash in changed:
+            if predicate(self.torrents[torrent_hash]):
+                self.candidates.add(torrent_hash)
+            else:
+                self.candidates.discard(torrent_hash)
+
+        self.rid = data.get("rid", self.rid)
+        return [self.torrents[torrent_hash] for torrent_hash in self.candidates], len(changed)
@@ -0,0 +1,94 @@
+import time
+from threading import Lock
+from typing import Callable
+
+from app.log import logger
+
+
+class TokenBucketLimiter:
+    """
+    下载器操作限速：按每秒操作数与每秒种子体积两个令牌桶放行，
+    qB 接口变慢或出错时按比例降低速率，恢复正常后逐步回升（AIMD）
+    """
+
+    # 单次接口耗时超过该值视为下载器繁忙（秒）
+    SLOW_LATENCY = 2.0
+    # 速率系数范围与每次调整幅度
+    MIN_FACTOR = 0.1
+    DECREASE = 0.5
+    INCREASE = 0.05
+
+    def __init__(self, name: str, ops_per_sec: float = 0, bytes_per_sec: float = 0):
+        self.name = name
+        self.ops_per_sec = max(float(ops_per_sec or 0), 0)
+        self.bytes_per_sec = max(float(bytes_per_sec or 0), 0)
+        self._lock = Lock()
+        self._factor = 1.0
+        self._updated = time.monotonic()
+        # 桶容量为1秒的额度，空闲后不会一次放行过多请求
+        self._ops_tokens = self.ops_per_sec
+        self._bytes_tokens = self.bytes_per_sec
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.ops_per_sec or self.bytes_per_sec)
+
+    def acquire(self, ops: int = 1, size: int = 0, stopped: Callable[[], bool] = None) -> bool:
+        """
+        等待令牌后放行，stopped 返回 True 时放弃等待并返回 False。
+        体积令牌允许透支，大种子放行后由后续操作等待偿还
+        """
+        if not self.enabled:
+            return True
+        while True:
+            with self._lock:
+                self.__refill()
+                ops_ready = not self.ops_per_sec or self._ops_tokens >= min(ops, self.ops_per_sec)
+                bytes_ready = not self.bytes_per_sec or self._bytes_tokens > 0
+                if ops_ready and bytes_ready:
+                    self._ops_tokens -= ops
+                    self._bytes_tokens -= size
+                    return True
+                wait = self.__wait_time(ops)
+            if stopped and stopped():
+                return False
+            time.sleep(min(wait, 1.0))
+
+    def record(self, latency: float, ok: bool = True):
+        """记录一次下载器接口调用结果，用于调整速率"""
+        if not self.enabled:
+            return
+        with self._lock:
+            if not ok or latency > self.SLOW_LATENCY:
+                factor = max(self._factor * self.DECREASE, self.MIN_FACTOR)
+                if factor != self._factor:
+                    logger.info(f"[{self.name}] 下载器响应变慢或出错（耗时 {latency:.1f}s），"
+                                f"限速降低到 {factor:.0%}")
+                self._factor = factor
+            elif self._factor < 1.0:
+                self._factor = min(self._factor + self.INCREASE, 1.0)
+
+    def __refill(self):
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+        if self.ops_per_sec:
+            self._ops_tokens = min(self._ops_tokens + elapsed * self.ops_per_sec * self._factor, self.ops_per_sec)
+        if self.bytes_per_sec:
+            self._bytes_tokens = min(self._bytes_tokens + elapsed * self.bytes_per_sec * self._factor,
+                                     self.bytes_per_sec)
+
+    def __wait_time(self, ops: int) -> float:
+        waits = [0.05]
+        if self.ops_per_sec:
+            needed = min(ops, self.ops_per_sec) - self._ops_tokens
+            if needed > 0:
+                waits.append(needed / (self.ops_per_sec * self._factor))
+        if self.bytes_per_sec and self._bytes_tokens <= 0:
+            waits.append((1 - self._bytes_tokens) / (self.bytes_per_sec * self._factor))
+        return max(waits)
+
+    def matches(self, ops_per_sec: float, bytes_per_sec: float) -> bool:
+        return self.ops_per_sec == max(float(ops_per_sec or 0), 0) \
+            and self.bytes_per_sec == max(float(bytes_per_sec or 0), 0)
+
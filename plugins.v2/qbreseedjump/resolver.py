@@ -0,0 +1,97 @@
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from app.log import logger
+
+
+class TrackerSiteResolver:
+    """
+    tracker → 站点名称解析器，映射表变更时编译一次：
+    先按 host:port、host 及其上级域名查索引，再按原有方式对映射项做子串匹配，
+    最后取域名的二级名；结果按 tracker 地址做 LRU 缓存，热路径不输出日志。
+    统计数据以 normalize() 得到的 host 为键，展示时再通过 site_name() 转为站点名称
+    """
+
+    # 推断站点名时忽略的常见前缀
+    PREFIXES = frozenset({"tracker", "www", "tra1", "t", "relay01"})
+    _HOST_RE = re.compile(r'^(?:[a-z][a-z0-9+.-]*://)?(?:[^@/]*@)?(?P<host>\[[^\]]+\]|[^/:?#]+)(?::(?P<port>\d+))?',
+                          re.IGNORECASE)
+
+    def __init__(self, mapping_text: str = "", cache_size: int = 4096):
+        self.mapping_text = mapping_text or ""
+        # 原始映射项（按配置顺序），用于子串匹配兜底
+        self.mapping: Dict[str, str] = {}
+        # host 或 host:port -> 站点名称
+        self._index: Dict[str, str] = {}
+        self.__compile()
+        self.resolve = lru_cache(maxsize=cache_size)(self._resolve)
+
+    def __compile(self):
+        for line in self.mapping_text.strip().splitlines():
+            line = line.strip()
+            if not line or ":" not in line:
+                continue
+            # 以最后一个冒号分隔，映射项可带端口，如 relay01.ptl.gs:8443:劳改所
+            key, site_name = (part.strip() for part in line.rsplit(":", 1))
+            if not key or not site_name:
+                continue
+            self.mapping.setdefault(key, site_name)
+            host, port = self.split_host(key)
+            if host:
+                self._index.setdefault(f"{host}:{port}" if port else host, site_name)
+        logger.debug(f"tracker映射表已编译：{len(self.mapping)} 条映射")
+
+    @classmethod
+    def split_host(cls, tracker_url: str) -> Tuple[Optional[str], Optional[str]]:
+        """从 tracker 地址中取出小写 host 与端口"""
+        match = cls._HOST_RE.match((tracker_url or "").strip())
+        if not match:
+            return None, None
+        return match.group("host").lower(), match.group("port")
+
+    @classmethod
+    def normalize(cls, tracker_url: str) -> str:
+        """统计使用的站点键：小写 host，带端口时为 host:port，无法解析返回空字符串"""
+        host, port = cls.split_host(tracker_url)
+        if not host:
+            return ""
+        return f"{host}:{port}" if port else host
+
+    @staticmethod
+    def is_host_key(key: str) -> bool:
+        """是否为 host 形式的站点键，旧版本统计数据中的键为站点名称"""
+        return bool(key) and ("." in key or ":" in key)
+
+    def site_name(self, key: str) -> str:
+        """统计键 → 展示用的站点名称，旧版本的站点名称键原样返回"""
+        return self.resolve(key) if self.is_host_key(key) else key
+
+    def _resolve(self, tracker_url: str) -> str:
+        if not tracker_url:
+            return '其他'
+
+        # 1) 映射表：host:port、host 及上级域名
+        host, port = self.split_host(tracker_url)
+        if host:
+            labels: List[str] = host.split(".")
+            for i in range(len(labels)):
+                suffix = ".".join(labels[i:])
+                if port and f"{suffix}:{port}" in self._index:
+                    return self._index[f"{suffix}:{port}"]
+                if suffix in self._index:
+                    return self._index[suffix]
+
+        # 2) 映射表：子串匹配（兼容写了路径等非域名的映射项）
+        for key, site_name in self.mapping.items():
+            if key in tracker_url:
+                return site_name
+
+        # 3) 推断域名的二级名（忽略常见前缀）
+        if host:
+            labels = [label for label in host.split(".") if label not in self.PREFIXES]
+            if len(labels) >= 2:
+                return labels[-2]
+
+        # 4) 仍失败
+        return '其他站点'
@@ -0,0 +1,393 @@
+import json
+import sqlite3
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from threading import Lock
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.log import logger
+
+
+class ReseedEventStore:
+    """
+    跳校事件日志：每个种子每次处理追加一条记录，按保留天数滚动清理
+    """
+
+    # (时间戳, 下载器, 种子hash, 站点, 大小, 结果, 阶段, 耗时)
+    Event = Tuple[int, str, str, str, int, str, str, float]
+
+    def __init__(self, path: Path, retention_days: int = 90):
+        self._path = path
+        self._retention_days = retention_days
+        self._lock = Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS events (
+                id INTEGER PRIMARY KEY,
+                ts INTEGER NOT NULL,
+                downloader TEXT NOT NULL,
+                infohash TEXT NOT NULL,
+                site TEXT,
+                size INTEGER NOT NULL DEFAULT 0,
+                outcome TEXT NOT NULL,
+                stage TEXT,
+                duration REAL NOT NULL DEFAULT 0
+            );
+            CREATE INDEX IF NOT EXISTS idx_events_ts ON events (ts);
+            CREATE INDEX IF NOT EXISTS idx_events_infohash ON events (infohash);
+        """)
+
+    def append(self, events: Iterable[Event]):
+        """追加事件，同一批在一个事务中写入"""
+        events = list(events)
+        if not events:
+            return
+        with self._lock:
+            try:
+                self._conn.execute("BEGIN")
+                self._conn.executemany(
+                    "INSERT INTO events (ts, downloader, infohash, site, size, outcome, stage, duration) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", events)
+                self._conn.execute("COMMIT")
+            except sqlite3.Error as e:
+                self._conn.execute("ROLLBACK")
+                logger.error(f"写入跳校事件失败: {e}")
+
+    def purge(self) -> int:
+        """删除超过保留天数的事件"""
+        cutoff = int(time.time()) - self._retention_days * 86400
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM events WHERE ts < ?", (cutoff,))
+            return cursor.rowcount
+
+    def clear(self) -> int:
+        """删除全部事件"""
+        with self._lock:
+            return self._conn.execute("DELETE FROM events").rowcount
+
+    def query(self, start: int = None, end: int = None, downloader: str = None, outcome: str = None,
+              infohash: str = None, limit: int = 500) -> List[Dict]:
+        """按时间范围、下载器、结果、hash 查询事件，按时间倒序"""
+        where, params = self.__where(start, end, downloader, outcome, infohash)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT ts, downloader, infohash, site, size, outcome, stage, duration FROM events"
+                f"{where} ORDER BY ts DESC, id DESC LIMIT ?", (*params, limit)).fetchall()
+        keys = ("ts", "downloader", "infohash", "site", "size", "outcome", "stage", "duration")
+        return [dict(zip(keys, row)) for row in rows]
+
+    def summary(self, start: int = None, end: int = None, downloader: str = None) -> List[Dict]:
+        """按下载器、站点、结果汇总数量与体积"""
+        where, params = self.__where(start, end, downloader, None, None)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT downloader, site, outcome, COUNT(*), COALESCE(SUM(size), 0) FROM events"
+                f"{where} GROUP BY downloader, site, outcome", params).fetchall()
+        keys = ("downloader", "site", "outcome", "count", "volume")
+        return [dict(zip(keys, row)) for row in rows]
+
+    @staticmethod
+    def __where(start: Optional[int], end: Optional[int], downloader: Optional[str],
+                outcome: Optional[str], infohash: Optional[str]) -> Tuple[str, tuple]:
+        clauses, params = [], []
+        if start is not None:
+            clauses.append("ts >= ?")
+            params.append(start)
+        if end is not None:
+            clauses.append("ts < ?")
+            params.append(end)
+        if downloader:
+            clauses.append("downloader = ?")
+            params.append(downloader)
+        if outcome:
+            clauses.append("outcome = ?")
+            params.append(outcome)
+        if infohash:
+            clauses.append("infohash = ?")
+            params.append(infohash.lower())
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", tuple(params)
+
+    def close(self):
+        with self._lock:
+            try:
+                self._conn.close()
+            except sqlite3.Error as e:
+                logger.debug(f"关闭跳校事件日志失败: {e}")
+
+
+class ReseedStatsStore:
+    """
+    跳校统计时序表：按 (粒度, 时间桶, 下载器, 站点) 累加，写入只更新当天涉及的行；
+    超过保留天数的日数据降采样为周数据，更早的周数据降采样为月数据。
+    跨月的周在月初处拆开，周桶总是落在同一个月内，再合并为月数据时不会计入上个月
+    """
+
+    # site 为空字符串的行记录下载器的成功/失败数，其余行记录各站点的数量与体积
+    TOTAL_SITE = ""
+
+    def __init__(self, path: Path, daily_days: int = 180, weekly_days: int = 730):
+        self._path = path
+        self._daily_days = daily_days
+        self._weekly_days = weekly_days
+        self._lock = Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS stats (
+                period TEXT NOT NULL,
+                bucket TEXT NOT NULL,
+                downloader TEXT NOT NULL,
+                site TEXT NOT NULL,
+                success INTEGER NOT NULL DEFAULT 0,
+                failed INTEGER NOT NULL DEFAULT 0,
+                count INTEGER NOT NULL DEFAULT 0,
+                volume INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (period, bucket, downloader, site)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_stats_bucket ON stats (bucket, downloader, site);
+        """)
+
+    def is_empty(self) -> bool:
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM stats LIMIT 1").fetchone() is None
+
+    def add(self, day: str, downloader: str, success: int, failed: int,
+            tracker_info: dict = None, volume_info: dict = None):
+        """累加某天某下载器的统计，day 格式为 YYYY-MM-DD"""
+        rows = [("day", day, downloader, self.TOTAL_SITE, success, failed, 0, 0)]
+        for site in set(tracker_info or {}) | set(volume_info or {}):
+            if not site:
+                continue
+            rows.append(("day", day, downloader, site, 0, 0,
+                         (tracker_info or {}).get(site, 0), (volume_info or {}).get(site, 0)))
+        with self._lock:
+            try:
+                self._conn.execute("BEGIN")
+                self._conn.executemany(
+                    "INSERT INTO stats (period, bucket, downloader, site, success, failed, count, volume) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (period, bucket, downloader, site) DO UPDATE SET "
+                    "success = success + excluded.success, failed = failed + excluded.failed, "
+                    "count = count + excluded.count, volume = volume + excluded.volume", rows)
+                self._conn.execute("COMMIT")
+            except sqlite3.Error as e:
+                self._conn.execute("ROLLBACK")
+                logger.error(f"写入统计时序数据失败: {e}")
+
+    def downsample(self, today: date = None) -> int:
+        """日数据 → 周数据（以周一为桶，跨月时以当月1日为桶），周数据 → 月数据，返回被合并的行数"""
+        today = today or date.today()
+        day_cutoff = (today - timedelta(days=self._daily_days)).strftime("%Y-%m-%d")
+        week_cutoff = (today - timedelta(days=self._weekly_days)).strftime("%Y-%m-%d")
+        steps = (
+            ("day", "week", "max(date(bucket, '-' || ((CAST(strftime('%w', bucket) AS INTEGER) + 6) % 7) || ' days'), "
+                            "substr(bucket, 1, 7) || '-01')",
+             day_cutoff),
+            ("week", "month", "substr(bucket, 1, 7)", week_cutoff),
+        )
+        merged = 0
+        with self._lock:
+            try:
+                self._conn.execute("BEGIN")
+                for source, target, bucket_expr, cutoff in steps:
+                    self._conn.execute(
+                        "INSERT INTO stats (period, bucket, downloader, site, success, failed, count, volume) "
+                        f"SELECT ?, {bucket_expr}, downloader, site, SUM(success), SUM(failed), SUM(count), "
+                        "SUM(volume) FROM stats WHERE period = ? AND bucket < ? "
+                        f"GROUP BY {bucket_expr}, downloader, site "
+                        "ON CONFLICT (period, bucket, downloader, site) DO UPDATE SET "
+                        "success = success + excluded.success, failed = failed + excluded.failed, "
+                        "count = count + excluded.count, volume = volume + excluded.volume",
+                        (target, source, cutoff))
+                    merged += self._conn.execute("DELETE FROM stats WHERE period = ? AND bucket < ?",
+                                                 (source, cutoff)).rowcount
+                self._conn.execute("COMMIT")
+            except sqlite3.Error as e:
+                self._conn.execute("ROLLBACK")
+                logger.error(f"统计时序数据降采样失败: {e}")
+                return 0
+        return merged
+
+    def clear(self) -> int:
+        """删除全部统计数据"""
+        with self._lock:
+            return self._conn.execute("DELETE FROM stats").rowcount
+
+    def query(self, start: str = None, end: str = None, downloader: str = None,
+              site: str = None) -> List[Dict]:
+        """
+        按日期范围（YYYY-MM-DD，含首尾）查询各时间桶的数据，周/月桶按起始日期计入
+        """
+        clauses, params = [], []
+        if start:
+            # 月桶与起始日期按相同长度比较，起始月份的月桶也计入
+            clauses.append("bucket >= substr(?, 1, length(bucket))")
+            params.append(start)
+        if end:
+            clauses.append("bucket <= ?")
+            params.append(end)
+        if downloader:
+            clauses.append("downloader = ?")
+            params.append(downloader)
+        if site is not None:
+            clauses.append("site = ?")
+            params.append(site)
+        where = (" WHERE " + " AND ".join(clauses)) if clauses else ""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT period, bucket, downloader, site, success, failed, count, volume FROM stats"
+                f"{where} ORDER BY bucket, downloader, site", params).fetchall()
+        keys = ("period", "bucket", "downloader", "site", "success", "failed", "count", "volume")
+        return [dict(zip(keys, row)) for row in rows]
+
+    def close(self):
+        with self._lock:
+            try:
+                self._conn.close()
+            except sqlite3.Error as e:
+                logger.debug(f"关闭统计时序数据失败: {e}")
+
+
+class ReseedStateStore:
+    """
+    跳校进度：每个种子按 导出 → 删除 → 添加 → 确认 推进，完成后删除记录；
+    中断或失败的种子保留种子文件与添加参数，下次运行从中断的阶段继续。
+    磁盘文件检查未通过的种子记录其特征，特征不变时不再作为候选种子
+    """
+
+    EXPORTED = "exported"
+    DELETED = "deleted"
+    ADDED = "added"
+
+    def __init__(self, path: Path):
+        self._path = path
+        self._lock = Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS pending (
+                downloader TEXT NOT NULL,
+                infohash TEXT NOT NULL,
+                name TEXT,
+                size INTEGER NOT NULL DEFAULT 0,
+                site TEXT,
+                stage TEXT NOT NULL,
+                content BLOB NOT NULL,
+                add_params TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_retry INTEGER NOT NULL DEFAULT 0,
+                error TEXT,
+                updated INTEGER NOT NULL,
+                PRIMARY KEY (downloader, infohash)
+            );
+            CREATE TABLE IF NOT EXISTS skipped (
+                downloader TEXT NOT NULL,
+                infohash TEXT NOT NULL,
+                fingerprint TEXT NOT NULL,
+                reason TEXT,
+                rechecked INTEGER NOT NULL DEFAULT 0,
+                updated INTEGER NOT NULL,
+                PRIMARY KEY (downloader, infohash)
+            );
+        """)
+
+    def save(self, downloader: str, infohash: str, name: str, size: int, site: Optional[str],
+             content: bytes, add_params: dict):
+        """记录已导出的种子，已有记录时保留重试次数"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO pending (downloader, infohash, name, size, site, stage, content, add_params, updated) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (downloader, infohash) DO UPDATE SET name = excluded.name, size = excluded.size, "
+                "site = excluded.site, stage = excluded.stage, content = excluded.content, "
+                "add_params = excluded.add_params, updated = excluded.updated",
+                (downloader, infohash, name, size, site, self.EXPORTED, content,
+                 json.dumps(add_params, ensure_ascii=False), int(time.time())))
+
+    def advance(self, downloader: str, infohashes: Iterable[str], stage: str):
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE pending SET stage = ?, updated = ? WHERE downloader = ? AND infohash = ?",
+                [(stage, int(time.time()), downloader, infohash) for infohash in infohashes])
+
+    def fail(self, downloader: str, infohash: str, error: str, backoff: int = 300):
+        """记录一次失败，下次重试时间按失败次数指数退避"""
+        now = int(time.time())
+        with self._lock:
+            self._conn.execute(
+                "UPDATE pending SET attempts = attempts + 1, error = ?, updated = ?, "
+                "next_retry = ? + ? * (1 << MIN(attempts, 10)) WHERE downloader = ? AND infohash = ?",
+                (error, now, now, backoff, downloader, infohash))
+
+    def remove(self, downloader: str, infohashes: Iterable[str]):
+        with self._lock:
+            self._conn.executemany("DELETE FROM pending WHERE downloader = ? AND infohash = ?",
+                                   [(downloader, infohash) for infohash in infohashes])
+
+    def due(self, downloader: str, max_attempts: int) -> List[Dict]:
+        """到达重试时间且未超过重试次数的记录"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT infohash, name, size, site, stage, content, add_params, attempts FROM pending "
+                "WHERE downloader = ? AND next_retry <= ? AND attempts < ? ORDER BY updated",
+                (downloader, int(time.time()), max_attempts)).fetchall()
+        keys = ("infohash", "name", "size", "site", "stage", "content", "add_params", "attempts")
+        records = [dict(zip(keys, row)) for row in rows]
+        for record in records:
+            record["add_params"] = json.loads(record["add_params"])
+        return records
+
+    def exhausted(self, downloader: str = None, max_attempts: int = 5) -> List[Dict]:
+        """超过重试次数、需要人工处理的记录（不含种子文件内容）"""
+        sql = "SELECT downloader, infohash, name, stage, attempts, error, updated FROM pending WHERE attempts >= ?"
+        params = [max_attempts]
+        if downloader:
+            sql += " AND downloader = ?"
+            params.append(downloader)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        keys = ("downloader", "infohash", "name", "stage", "attempts", "error", "updated")
+        return [dict(zip(keys, row)) for row in rows]
+
+    def skip(self, downloader: str, infohash: str, fingerprint: str, reason: str, rechecked: bool = False):
+        """记录磁盘文件检查未通过的种子，已让下载器重新校验过的保持该标记"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO skipped (downloader, infohash, fingerprint, reason, rechecked, updated) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (downloader, infohash) DO UPDATE SET fingerprint = excluded.fingerprint, "
+                "reason = excluded.reason, rechecked = MAX(rechecked, excluded.rechecked), "
+                "updated = excluded.updated",
+                (downloader, infohash, fingerprint, reason, int(bool(rechecked)), int(time.time())))
+
+    def skipped(self, downloader: str, retention_days: int = 30) -> Dict[str, Tuple[str, bool]]:
+        """磁盘文件检查未通过的种子：hash → (特征, 是否已重新校验)；超过保留天数未再出现的记录先清理"""
+        cutoff = int(time.time()) - retention_days * 86400
+        with self._lock:
+            self._conn.execute("DELETE FROM skipped WHERE downloader = ? AND updated < ?", (downloader, cutoff))
+            rows = self._conn.execute("SELECT infohash, fingerprint, rechecked FROM skipped WHERE downloader = ?",
+                                      (downloader,)).fetchall()
+        return {infohash: (fingerprint, bool(rechecked)) for infohash, fingerprint, rechecked in rows}
+
+    def touch(self, downloader: str, infohashes: Iterable[str]):
+        """仍在下载器中的记录刷新时间，避免被清理"""
+        with self._lock:
+            self._conn.executemany("UPDATE skipped SET updated = ? WHERE downloader = ? AND infohash = ?",
+                                   [(int(time.time()), downloader, infohash) for infohash in infohashes])
+
+    def unskip(self, downloader: str, infohashes: Iterable[str]):
+        with self._lock:
+            self._conn.executemany("DELETE FROM skipped WHERE downloader = ? AND infohash = ?",
+                                   [(downloader, infohash) for infohash in infohashes])
+
+    def close(self):
+        with self._lock:
+            try:
+                self._conn.close()
+            except sqlite3.Error as e:
+                logger.debug(f"关闭跳校进度记录失败: {e}")